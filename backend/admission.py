@@ -0,0 +1,195 @@
+"""
+Admission Control
+Per-route concurrency limits with bounded wait queues and fast 503 Retry-After rejection
+"""
+import os
+import json
+import math
+import time
+import asyncio
+from collections import deque
+from typing import Dict, Any, Optional
+
+from metrics import ADMISSION_REJECTIONS, register_queue, route_template
+
+
+def _limits(cost_class: str, concurrency: int, queue: int, timeout: float) -> Dict[str, Any]:
+    prefix = f"ADMISSION_{cost_class.upper()}"
+    return {
+        'concurrency': int(os.getenv(f"{prefix}_CONCURRENCY", str(concurrency))),
+        'queue': int(os.getenv(f"{prefix}_QUEUE", str(queue))),
+        'timeout': float(os.getenv(f"{prefix}_TIMEOUT", str(timeout)))
+    }
+
+
+# Default limits per cost class; each route gets its own limiter with these limits
+COST_CLASSES = {
+    'cheap': _limits('cheap', concurrency=256, queue=512, timeout=2.0),
+    'standard': _limits('standard', concurrency=16, queue=64, timeout=10.0),
+    'expensive': _limits('expensive', concurrency=4, queue=16, timeout=20.0),
+}
+
+# Route template -> cost class. Unlisted routes are exempt (health, metrics, SSE streams).
+ROUTE_COSTS = {
+    ('POST', '/analyze'): 'cheap',
+    ('POST', '/complaint'): 'cheap',
+    ('GET', '/jobs/{job_id}'): 'cheap',
+    ('GET', '/cache/stats'): 'cheap',
+    ('POST', '/analyze/image'): 'standard',
+    ('POST', '/analyze/audio'): 'standard',
+    ('POST', '/generate-evidence-pack'): 'standard',
+    ('POST', '/jobs'): 'standard',
+    ('POST', '/analyze/video'): 'expensive',
+    ('POST', '/analyze/batch'): 'expensive',
+    ('POST', '/analyze/text'): 'expensive',
+    ('POST', '/analyze/text/stream'): 'expensive',
+}
+
+
+class Overloaded(Exception):
+    """Raised when a request cannot be admitted"""
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionLimiter:
+    """
+    Concurrency limit for one route with a bounded FIFO wait queue.
+
+    Requests beyond `concurrency` wait for a slot; once `queue` requests are
+    already waiting, new ones are rejected immediately instead of piling up.
+    Waiters that don't get a slot within `timeout` seconds are rejected too.
+    """
+
+    def __init__(self, name: str, concurrency: int, queue: int, timeout: float):
+        self.name = name
+        self.concurrency = concurrency
+        self.max_queue = queue
+        self.timeout = timeout
+        self.active = 0
+        self._waiters: "deque[asyncio.Future]" = deque()
+        # Smoothed request duration, used to suggest Retry-After
+        self._avg_service_time = 1.0
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    def retry_after(self) -> int:
+        """Seconds until a slot is likely to free up for a new request"""
+        backlog = (self.waiting + 1) / max(1, self.concurrency)
+        return max(1, min(60, math.ceil(backlog * self._avg_service_time)))
+
+    async def acquire(self):
+        if self.active < self.concurrency and not self._waiters:
+            self.active += 1
+            return
+
+        if self.waiting >= self.max_queue:
+            raise Overloaded('queue_full', self.retry_after())
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout=self.timeout)
+        except asyncio.TimeoutError:
+            raise Overloaded('queue_timeout', self.retry_after())
+        except asyncio.CancelledError:
+            # A slot may have been handed to us just as we were cancelled
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+
+    def release(self, service_time: Optional[float] = None):
+        if service_time is not None:
+            self._avg_service_time = 0.8 * self._avg_service_time + 0.2 * service_time
+
+        # Hand the slot straight to the next live waiter
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'active': self.active,
+            'waiting': self.waiting,
+            'concurrency': self.concurrency,
+            'max_queue': self.max_queue
+        }
+
+
+class AdmissionMiddleware:
+    """
+    ASGI middleware applying an AdmissionLimiter per route.
+
+    Rejection happens before the request body is read, so shed uploads never
+    reach the temp directory and shed fact-checks never reach Ollama or Gemini.
+    Cheap routes have their own generous limits and stay fast under overload.
+    """
+
+    def __init__(self, app, route_costs: Dict = None, cost_classes: Dict = None):
+        self.app = app
+        self.route_costs = route_costs if route_costs is not None else ROUTE_COSTS
+        self.cost_classes = cost_classes if cost_classes is not None else COST_CLASSES
+        self.limiters: Dict[str, AdmissionLimiter] = {}
+
+    def _limiter_for(self, method: str, route: str) -> Optional[AdmissionLimiter]:
+        cost_class = self.route_costs.get((method, route))
+        if cost_class is None:
+            return None
+
+        key = f"{method} {route}"
+        limiter = self.limiters.get(key)
+        if limiter is None:
+            limiter = AdmissionLimiter(key, **self.cost_classes[cost_class])
+            self.limiters[key] = limiter
+            register_queue(f"admission {key}", lambda: limiter.waiting)
+        return limiter
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        limiter = self._limiter_for(scope['method'], route_template(scope))
+        if limiter is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await limiter.acquire()
+        except Overloaded as e:
+            ADMISSION_REJECTIONS.labels(limiter.name, e.reason).inc()
+            await self._reject(send, e)
+            return
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release(time.perf_counter() - start)
+
+    async def _reject(self, send, error: Overloaded):
+        body = json.dumps({
+            'detail': 'Server is at capacity for this endpoint. Retry later.',
+            'reason': error.reason
+        }).encode('utf-8')
+        await send({
+            'type': 'http.response.start',
+            'status': 503,
+            'headers': [
+                (b'content-type', b'application/json'),
+                (b'content-length', str(len(body)).encode('latin-1')),
+                (b'retry-after', str(error.retry_after).encode('latin-1')),
+            ]
+        })
+        await send({'type': 'http.response.body', 'body': body})
@@ -1,8 +1,22 @@
+import os
+import re
 import json
+import asyncio
+from agents.claim_filter import HIGH_RISK_KEYWORDS, split_sentences, select_candidates, chunk_sentences
 from tools.ollama_client import run_ollama
+from tools.llm_cache import llm_cache, build_llm_cache_key, prompt_version
+from tools.llm_scheduler import LLMDeadlineExceeded
 
-def extract_claims(text: str):
-    prompt = f"""
+# Texts longer than this are pre-filtered to their most claim-like sentences
+# and extracted in chunks instead of one prompt
+LONG_TEXT_CHARS = int(os.getenv("CLAIM_LONG_TEXT_CHARS", "1500"))
+MAX_CANDIDATE_SENTENCES = int(os.getenv("CLAIM_MAX_SENTENCES", "24"))
+CHUNK_CHARS = int(os.getenv("CLAIM_CHUNK_CHARS", "1200"))
+
+# A JSON list of short claims; article text needs more context than the default window
+OLLAMA_OPTIONS = {"num_predict": 512, "num_ctx": 4096}
+
+PROMPT_TEMPLATE = """
 You are an information extraction system.
 
 Task:
@@ -28,19 +42,77 @@ Text:
 {text}
 """
 
-    raw = run_ollama(prompt)
+PROMPT_VERSION = prompt_version(PROMPT_TEMPLATE, OLLAMA_OPTIONS)
 
-    # 1️⃣ Try parsing LLaMA output
-    try:
-        claims = json.loads(raw)
-        if not isinstance(claims, list):
+async def _extract_chunk(text: str):
+    # Repeated texts (forwards, re-shares) skip the LLM
+    cache_key = build_llm_cache_key("extract_claims", PROMPT_VERSION, text)
+    claims = llm_cache.get(cache_key)
+
+    if claims is None:
+        raw = await run_ollama(PROMPT_TEMPLATE.format(text=text), options=OLLAMA_OPTIONS)
+
+        # 1️⃣ Try parsing LLaMA output
+        try:
+            claims = json.loads(raw)
+            if not isinstance(claims, list):
+                claims = []
+            else:
+                llm_cache.set(cache_key, claims)
+        except Exception:
             claims = []
-    except Exception:
-        claims = []
 
-    # 2️⃣ HARD FALLBACK for high-risk keywords
-    HIGH_RISK_KEYWORDS = ["died", "death", "cancer", "killed", "murder"]
+    return claims
 
+async def _extract_chunks(chunks):
+    # A failed chunk is skipped; a passed deadline is fatal for every chunk, so
+    # the rest are cancelled instead of holding LLM slots for a dead request
+    tasks = [asyncio.create_task(_extract_chunk(chunk)) for chunk in chunks]
+    pending = set(tasks)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                if isinstance(task.exception(), LLMDeadlineExceeded):
+                    raise task.exception()
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    results = [t.result() for t in tasks if t.exception() is None]
+    errors = [t.exception() for t in tasks if t.exception() is not None]
+    if errors:
+        if not results:
+            raise errors[0]
+        print(f"Claim extraction skipped {len(errors)} of {len(tasks)} chunks: {errors[0]}")
+    return results
+
+def _merge_claims(chunk_results):
+    # Same claim found in several chunks (or worded with different spacing/case) is kept once
+    merged, seen = [], set()
+    for claims in chunk_results:
+        for c in claims:
+            if not isinstance(c, dict) or not c.get("claim"):
+                continue
+            key = re.sub(r'[^a-z0-9]+', ' ', str(c["claim"]).lower()).strip()
+            if key not in seen:
+                seen.add(key)
+                merged.append(c)
+    return merged
+
+async def extract_claims(text: str):
+    if len(text) <= LONG_TEXT_CHARS:
+        claims = await _extract_chunk(text)
+    else:
+        candidates = (
+            select_candidates(text, MAX_CANDIDATE_SENTENCES)
+            or split_sentences(text)[:MAX_CANDIDATE_SENTENCES]
+        )
+        chunks = chunk_sentences(candidates, CHUNK_CHARS)
+        claims = _merge_claims(await _extract_chunks(chunks))
+
+    # 2️⃣ HARD FALLBACK for high-risk keywords
     if not claims and any(k in text.lower() for k in HIGH_RISK_KEYWORDS):
         claims = [
             {
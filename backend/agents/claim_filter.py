@@ -0,0 +1,77 @@
+import re
+
+# Claims about these are always worth checking (also used as the extraction fallback)
+HIGH_RISK_KEYWORDS = ["died", "death", "cancer", "killed", "murder"]
+
+HEALTH_WORDS = [
+    "dead", "dies", "hospital", "hospitalized", "illness", "disease", "virus",
+    "vaccine", "cure", "cures", "infected", "poison", "overdose", "attack", "arrested"
+]
+
+REPORTING_WORDS = [
+    "said", "says", "announced", "confirmed", "reported", "according to",
+    "claimed", "claims", "revealed", "approved", "banned", "study", "officials"
+]
+
+SENTENCE_END = re.compile(r'(?<=[.!?])\s+(?=[A-Z0-9"\'“])|\n+')
+NUMBER = re.compile(r'\d')
+# Capitalized word that isn't sentence-initial: a cheap stand-in for named entities
+ENTITY = re.compile(r'(?<=\s)[A-Z][a-zA-Z]+')
+
+MIN_WORDS = 5
+MAX_SENTENCE_CHARS = 400
+
+
+def split_sentences(text: str):
+    sentences = []
+    for part in SENTENCE_END.split(text or ""):
+        part = " ".join(part.split())
+        if len(part.split()) >= MIN_WORDS:
+            sentences.append(part[:MAX_SENTENCE_CHARS])
+    return sentences
+
+
+def claim_score(sentence: str) -> float:
+    lower = sentence.lower()
+    score = 0.0
+
+    score += 3.0 * sum(1 for k in HIGH_RISK_KEYWORDS if k in lower)
+    score += 1.5 * sum(1 for k in HEALTH_WORDS if k in lower)
+    score += 1.0 * sum(1 for k in REPORTING_WORDS if k in lower)
+    score += min(3, len(NUMBER.findall(sentence))) * 0.5
+    score += min(4, len(ENTITY.findall(sentence))) * 0.5
+
+    # Questions and opinions rarely carry checkable claims
+    if sentence.endswith("?"):
+        score -= 2.0
+    if re.search(r'\b(i think|i believe|in my opinion|maybe|perhaps)\b', lower):
+        score -= 1.0
+
+    return score
+
+
+def select_candidates(text: str, max_sentences: int):
+    # Highest-scoring sentences, returned in their original order
+    sentences, seen = [], set()
+    for sentence in split_sentences(text):
+        # Boilerplate and pull quotes repeat; send each sentence once
+        key = sentence.lower()
+        if key not in seen:
+            seen.add(key)
+            sentences.append(sentence)
+    scored = [(claim_score(s), i, s) for i, s in enumerate(sentences)]
+    best = sorted((x for x in scored if x[0] > 0), key=lambda x: (-x[0], x[1]))[:max_sentences]
+    return [s for _, _, s in sorted(best, key=lambda x: x[1])]
+
+
+def chunk_sentences(sentences, max_chars: int):
+    chunks, current, size = [], [], 0
+    for sentence in sentences:
+        if current and size + len(sentence) + 1 > max_chars:
+            chunks.append(" ".join(current))
+            current, size = [], 0
+        current.append(sentence)
+        size += len(sentence) + 1
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
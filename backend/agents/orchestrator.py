@@ -1,28 +1,47 @@
 from agents.claim_extractor import extract_claims
-from agents.verifier import verify_claims
-from agents.reason_generator import generate_reason
+from agents.verifier import iter_verified_claims
+from agents.reason_generator import generate_reason, stream_reason
 from tools.scraper import scrape_url
 
 def is_valid_url(url: str) -> bool:
     return isinstance(url, str) and url.startswith(("http://", "https://"))
 
 
-def fact_check_pipeline(input_text: str, url: str = None):
+def _report(progress, stage: str, **data):
+    # Optional stage callback (used by background jobs for progress events)
+    if progress is not None:
+        progress(stage, **data)
+
+
+async def fact_check_pipeline(input_text: str, url: str = None, progress=None):
+    async for event in fact_check_events(input_text, url):
+        stage = event.pop("stage")
+        if stage == "result":
+            return event
+        _report(progress, stage, **event)
+
+
+async def fact_check_events(input_text: str, url: str = None, stream_tokens: bool = False):
+    # Runs the pipeline, yielding {"stage": ..., ...} as each step completes.
+    # The last event is always {"stage": "result", verdict, claims, reason}.
     HIGH_RISK_TYPES = ["death", "health"]
 
     # 1️⃣ Get text
     if url and is_valid_url(url):
-        scraped = scrape_url(url)
+        scraped = await scrape_url(url)
         text = scraped.get("text", "")
+        yield {"stage": "scrape", "chars": len(text), "error": scraped.get("error")}
     else:
         text = input_text or ""
 
     # 2️⃣ Extract claims
-    claims = extract_claims(text)
+    claims = await extract_claims(text)
+    yield {"stage": "extract_claims", "claims": claims}
 
     # 🚨 HARD FALLBACK: no claims
     if not claims:
-        return {
+        yield {
+            "stage": "result",
             "verdict": "Unverified",
             "claims": [],
             "reason": (
@@ -30,16 +49,26 @@ def fact_check_pipeline(input_text: str, url: str = None):
                 "identifiable claims or credible supporting evidence."
             )
         }
+        return
 
     # 3️⃣ Detect high-risk claims
     high_risk = any(c.get("type") in HIGH_RISK_TYPES for c in claims)
 
     # 4️⃣ Verify claims
-    verification = verify_claims(claims, text)
+    verification = [None] * len(claims)
+    async for index, result in iter_verified_claims(claims, text):
+        verification[index] = result
+        yield {"stage": "claim", "index": index, **result}
+    yield {
+        "stage": "verify_claims",
+        "verified": sum(1 for v in verification if v.get("status") == "verified"),
+        "total": len(verification)
+    }
 
     # 5️⃣ High-risk + no URL → IMMEDIATE FAKE
     if high_risk and not url:
-        return {
+        yield {
+            "stage": "result",
             "verdict": "Fake",
             "claims": verification,
             "reason": (
@@ -48,6 +77,7 @@ def fact_check_pipeline(input_text: str, url: str = None):
                 "Such claims are commonly associated with misinformation."
             )
         }
+        return
 
     # 6️⃣ Evidence-based decision
     fake_signals = [
@@ -59,14 +89,23 @@ def fact_check_pipeline(input_text: str, url: str = None):
 
     # 7️⃣ Only call LLaMA if signals exist
     if verification:
-        reason = generate_reason(verdict, verification)
+        if stream_tokens:
+            tokens = []
+            async for token in stream_reason(verdict, verification):
+                tokens.append(token)
+                yield {"stage": "reason_token", "token": token}
+            reason = "".join(tokens)
+        else:
+            reason = await generate_reason(verdict, verification)
+        yield {"stage": "generate_reason"}
     else:
         reason = (
             "No sufficient verification signals were available to reach "
             "a definitive conclusion."
         )
 
-    return {
+    yield {
+        "stage": "result",
         "verdict": verdict,
         "claims": verification,
         "reason": reason
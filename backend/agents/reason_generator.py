@@ -1,7 +1,11 @@
-from tools.ollama_client import run_ollama
+import json
+from tools.ollama_client import run_ollama, stream_ollama
+from tools.llm_cache import llm_cache, build_llm_cache_key, prompt_version
 
-def generate_reason(verdict, signals):
-    prompt = f"""
+# A few sentences of explanation over a short signal list
+OLLAMA_OPTIONS = {"num_predict": 256, "num_ctx": 2048}
+
+PROMPT_TEMPLATE = """
 You are explaining why a news item was marked as {verdict}.
 Base explanation ONLY on the signals below.
 Be neutral and factual.
@@ -9,4 +13,40 @@ Be neutral and factual.
 Signals:
 {signals}
 """
-    return run_ollama(prompt)
+
+PROMPT_VERSION = prompt_version(PROMPT_TEMPLATE, OLLAMA_OPTIONS)
+
+def _cache_key(verdict, signals):
+    return build_llm_cache_key(
+        "generate_reason", PROMPT_VERSION,
+        json.dumps([verdict, signals], sort_keys=True, default=str)
+    )
+
+async def generate_reason(verdict, signals):
+    cache_key = _cache_key(verdict, signals)
+    reason = llm_cache.get(cache_key)
+    if reason is None:
+        reason = await run_ollama(
+            PROMPT_TEMPLATE.format(verdict=verdict, signals=signals),
+            options=OLLAMA_OPTIONS
+        )
+        if reason:
+            llm_cache.set(cache_key, reason)
+    return reason
+
+async def stream_reason(verdict, signals):
+    # Same explanation as generate_reason, yielded token by token
+    cache_key = _cache_key(verdict, signals)
+    reason = llm_cache.get(cache_key)
+    if reason is not None:
+        yield reason
+        return
+
+    tokens = []
+    prompt = PROMPT_TEMPLATE.format(verdict=verdict, signals=signals)
+    async for token in stream_ollama(prompt, options=OLLAMA_OPTIONS):
+        tokens.append(token)
+        yield token
+
+    if tokens:
+        llm_cache.set(cache_key, "".join(tokens))
@@ -1,25 +1,162 @@
-from tools.source_check import search_web
+import os
+import time
+import asyncio
+from urllib.parse import urlparse
+from tools.source_check import search_web, SEARCH_URL
 from tools.scraper import scrape_url
+from tools.evidence_matcher import EvidenceIndex
 
-def verify_claims(claims, original_text):
-    results = []
+# Outbound requests across all claims, and per remote host
+VERIFY_CONCURRENCY = int(os.getenv("VERIFY_CONCURRENCY", "16"))
+VERIFY_PER_HOST = int(os.getenv("VERIFY_PER_HOST", "2"))
+# Seconds the whole verification stage may take; unfinished claims are reported as timed out
+VERIFY_TIME_BUDGET = float(os.getenv("VERIFY_TIME_BUDGET", "20"))
 
-    for c in claims:
-        claim_text = c["claim"]
 
-        urls = search_web(claim_text)
-        evidence_found = False
+class _HostLimiter:
+    # Global + per-host semaphores; per-host entries are dropped once idle
+    def __init__(self, total: int, per_host: int):
+        self.total = total
+        self.per_host = per_host
+        self._global = None
+        self._hosts = {}
 
+    async def run(self, url, fn):
+        if self._global is None:
+            self._global = asyncio.Semaphore(self.total)
+        host = urlparse(url).netloc.lower()
+        entry = self._hosts.setdefault(host, [asyncio.Semaphore(self.per_host), 0])
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                async with self._global:
+                    return await fn()
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0 and self._hosts.get(host) is entry:
+                del self._hosts[host]
+
+
+_limiter = _HostLimiter(VERIFY_CONCURRENCY, VERIFY_PER_HOST)
+
+
+class _SharedPages:
+    # One download-and-score task per URL, shared by every claim that found it.
+    # Each page is scored against all claims of the request in one match() call;
+    # the weights depend only on the claims, so scoring page by page gives the
+    # same scores as one index over every page.
+    def __init__(self, texts):
+        self.texts = texts
+        self._tasks = {}
+        self._wanted = {}
+        self.spawned = []
+
+    async def _score(self, url):
+        page = await _limiter.run(url, lambda: scrape_url(url))
+        if not page.get("text"):
+            return [None] * len(self.texts)
+        return await asyncio.to_thread(lambda: EvidenceIndex([page]).match(self.texts))
+
+    def get(self, url, index):
+        task = self._tasks.get(url)
+        if task is None:
+            task = asyncio.create_task(self._score(url))
+            self._tasks[url] = task
+            self._wanted[url] = set()
+            self.spawned.append(task)
+        self._wanted[url].add(index)
+        return task
+
+    def release(self, url, index):
+        # A download nobody waits for any more is cancelled
+        wanted = self._wanted.get(url)
+        if wanted is None:
+            return
+        wanted.discard(index)
+        if not wanted:
+            task = self._tasks.pop(url)
+            del self._wanted[url]
+            if not task.done():
+                task.cancel()
+
+async def _verify_claim(index, c, pages):
+    claim_text = c["claim"]
+
+    try:
+        urls = await _limiter.run(SEARCH_URL, lambda: search_web(claim_text))
+    except Exception:
+        # One claim's failed search must not sink the others; it isn't evidence either way
+        return {"claim": claim_text, "type": c["type"], "status": "search_failed"}
+
+    urls = list(dict.fromkeys(urls))
+    evidence = None
+    try:
+        # Candidate pages arrive concurrently; the first confirmation wins
+        pending = {pages.get(url, index) for url in urls}
+        while pending and evidence is None:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            matches = [
+                t.result()[index] for t in done
+                if not t.cancelled() and t.exception() is None and t.result()[index]
+            ]
+            if matches:
+                evidence = max(matches, key=lambda m: m["score"])
+    finally:
+        # Confirmed, out of time or abandoned: stop this claim's remaining downloads
         for url in urls:
-            article_text = scrape_url(url)
-            if claim_text.lower() in article_text.lower():
-                evidence_found = True
+            pages.release(url, index)
+
+    result = {
+        "claim": claim_text,
+        "type": c["type"],
+        "status": "verified" if evidence else "no_evidence_found"
+    }
+    if evidence:
+        result["evidence"] = evidence
+    return result
+
+async def iter_verified_claims(claims, original_text, time_budget=None):
+    # Yields (index, result) as each claim's verification resolves: on its first
+    # confirming page, or once all of its own sources are in
+    budget = VERIFY_TIME_BUDGET if time_budget is None else time_budget
+    deadline = time.monotonic() + budget
+    pages = _SharedPages([c["claim"] for c in claims])
+    tasks = {asyncio.create_task(_verify_claim(i, c, pages)): i for i, c in enumerate(claims)}
+    pending = set(tasks)
+
+    try:
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
                 break
+            done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield tasks[task], _result_of(task, claims[tasks[task]])
+
+        # Out of time: report what's left without a verdict
+        late, pending = pending, set()
+        for task in late:
+            task.cancel()
+        await asyncio.gather(*late, return_exceptions=True)
+        for task in late:
+            c = claims[tasks[task]]
+            yield tasks[task], {"claim": c["claim"], "type": c["type"], "status": "timed_out"}
+    finally:
+        # Consumer stopped early (client disconnect) or something failed: stop and reap the rest
+        leftovers = {*pending, *pages.spawned}
+        for task in leftovers:
+            task.cancel()
+        await asyncio.gather(*leftovers, return_exceptions=True)
+
+def _result_of(task, c):
+    if task.exception() is not None:
+        return {"claim": c["claim"], "type": c["type"], "status": "search_failed"}
+    return task.result()
+
+async def verify_claims(claims, original_text):
+    results = [None] * len(claims)
 
-        results.append({
-            "claim": claim_text,
-            "type": c["type"],
-            "status": "verified" if evidence_found else "no_evidence_found"
-        })
+    async for index, result in iter_verified_claims(claims, original_text):
+        results[index] = result
 
     return results
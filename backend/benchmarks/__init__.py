@@ -0,0 +1,3 @@
+"""
+Micro-benchmarks for start-up time and upstream client behaviour
+"""
@@ -0,0 +1,70 @@
+"""
+Gemini Micro-Batching Benchmark
+Compares one proxy request per prompt against micro-batched /generate/batch requests
+
+Usage (from backend/):
+    python -m benchmarks.gemini_batch_bench --requests 400 --concurrency 64 --latency 0.2
+    python -m benchmarks.gemini_batch_bench --no-batch-endpoint   # exercise the fallback
+"""
+import os
+import time
+import asyncio
+import argparse
+
+import httpx
+
+from benchmarks.gemini_pool_bench import start_stand_in, measure, report
+
+
+async def run_mode(label: str, base_url: str, window_ms: float, args):
+    os.environ["GEMINI_BATCH_WINDOW_MS"] = str(window_ms)
+    os.environ["GEMINI_BATCH_MAX"] = str(args.batch_max)
+    from gemini_client import GeminiClient
+
+    client = GeminiClient()
+    client.base_url = base_url
+    # Measure request fan-in only; errors shouldn't trip the breaker mid-run
+    client.breaker.failure_threshold = args.requests + 1
+    await client.generate("warm-up")
+
+    upstream_before = httpx.get(f"{base_url}/_stats").json()["gemini"]
+    start = time.perf_counter()
+    latencies = await measure(client.generate, args.requests, args.concurrency)
+    wall = time.perf_counter() - start
+    upstream = httpx.get(f"{base_url}/_stats").json()["gemini"] - upstream_before
+    await client.close()
+
+    report(label, latencies, wall)
+    print(f"{'':<10} upstream requests: {upstream}  ({args.requests / max(1, upstream):.1f} prompts/request)")
+
+
+async def run(base_url: str, args):
+    print(f"target: {base_url}  prompts: {args.requests}  concurrency: {args.concurrency}  "
+          f"window: {args.window_ms} ms  max batch: {args.batch_max}")
+    await run_mode("per-item", base_url, 0, args)
+    await run_mode("batched", base_url, args.window_ms, args)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Gemini prompt micro-batching")
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--latency", type=float, default=0.2,
+                        help="server-side latency of the stand-in per request (seconds)")
+    parser.add_argument("--window-ms", type=float, default=5.0)
+    parser.add_argument("--batch-max", type=int, default=16)
+    parser.add_argument("--no-batch-endpoint", action="store_true",
+                        help="stand-in without /generate/batch, to measure the fallback path")
+    args = parser.parse_args()
+
+    extra = ("--no-gemini-batch",) if args.no_batch_endpoint else ()
+    proc, base_url = start_stand_in(args.latency, extra)
+    try:
+        asyncio.run(run(base_url, args))
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+
+if __name__ == "__main__":
+    main()
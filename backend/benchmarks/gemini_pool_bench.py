@@ -0,0 +1,118 @@
+"""
+Gemini Connection Pool Benchmark
+Compares a fresh AsyncClient per prompt against the pooled keep-alive GeminiClient
+
+Usage (from backend/):
+    python -m benchmarks.gemini_pool_bench --requests 200 --concurrency 8
+    python -m benchmarks.gemini_pool_bench --target https://my-gemini-proxy.onrender.com
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+import statistics
+import subprocess
+from typing import List, Optional, Tuple
+
+import httpx
+
+from loadtest.run import BACKEND_DIR, _free_port, _wait_until_up, percentile
+
+
+def start_stand_in(latency: float, extra_args: Tuple[str, ...] = ()) -> Tuple[subprocess.Popen, str]:
+    """Run the fake Gemini proxy from loadtest.fakes on a free local port"""
+    port = _free_port()
+    cmd = [
+        sys.executable, "-m", "loadtest.fakes", "--port", str(port),
+        "--gemini-latency", str(latency), "--gemini-jitter", "0", *extra_args
+    ]
+    proc = subprocess.Popen(cmd, cwd=BACKEND_DIR)
+    base_url = f"http://127.0.0.1:{port}"
+    _wait_until_up(f"{base_url}/_stats")
+    return proc, base_url
+
+
+async def per_call_generate(base_url: str, prompt: str) -> Optional[str]:
+    """The previous behaviour: a new client (and connection) for every prompt"""
+    async with httpx.AsyncClient() as client:
+        response = await client.post(f"{base_url}/generate", json={"text": prompt}, timeout=30.0)
+        return response.json().get("text") if response.status_code == 200 else None
+
+
+async def measure(call, requests: int, concurrency: int) -> List[float]:
+    """Latency in seconds of each of `requests` calls, `concurrency` at a time"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+
+    async def one(i: int):
+        async with semaphore:
+            start = time.perf_counter()
+            await call(f"benchmark prompt {i}")
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    return latencies
+
+
+def report(label: str, latencies: List[float], wall: float):
+    print(
+        f"{label:<10} median {statistics.median(latencies) * 1000:7.2f} ms   "
+        f"p95 {percentile(latencies, 95) * 1000:7.2f} ms   "
+        f"p99 {percentile(latencies, 99) * 1000:7.2f} ms   "
+        f"throughput {len(latencies) / wall:7.1f} req/s"
+    )
+
+
+async def run(base_url: str, args):
+    os.environ["GEMINI_API_URL"] = base_url
+    from gemini_client import GeminiClient
+
+    pooled = GeminiClient()
+    # Measure transport cost only; a failing stand-in shouldn't trip the breaker mid-run
+    pooled.breaker.failure_threshold = args.requests + 1
+
+    # Warm both paths once so imports and the first handshake aren't counted
+    await per_call_generate(base_url, "warm-up")
+    await pooled.generate("warm-up")
+
+    start = time.perf_counter()
+    per_call = await measure(lambda p: per_call_generate(base_url, p), args.requests, args.concurrency)
+    per_call_wall = time.perf_counter() - start
+
+    start = time.perf_counter()
+    pooled_latencies = await measure(pooled.generate, args.requests, args.concurrency)
+    pooled_wall = time.perf_counter() - start
+    await pooled.close()
+
+    print(f"target: {base_url}  requests: {args.requests}  concurrency: {args.concurrency}")
+    report("per-call", per_call, per_call_wall)
+    report("pooled", pooled_latencies, pooled_wall)
+    saving = statistics.median(per_call) - statistics.median(pooled_latencies)
+    print(f"median saving per call: {saving * 1000:.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Gemini client connection reuse")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="server-side latency of the local stand-in (seconds)")
+    parser.add_argument("--target", default=None,
+                        help="benchmark an existing Gemini proxy (e.g. over TLS) instead of the stand-in")
+    args = parser.parse_args()
+
+    proc = None
+    base_url = args.target
+    if base_url is None:
+        proc, base_url = start_stand_in(args.latency)
+    try:
+        asyncio.run(run(base_url.rstrip("/"), args))
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait(timeout=10)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Import Profile
+Reports which modules dominate `import main` using Python's -X importtime
+
+Usage (from backend/):
+    python -m benchmarks.import_profile --top 25
+    python -m benchmarks.import_profile --module tools.scraper
+"""
+import os
+import sys
+import argparse
+import subprocess
+from typing import List, Tuple
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def profile_imports(module: str) -> List[Tuple[str, int, int, int]]:
+    """
+    Import a module in a fresh interpreter and collect per-module timings.
+
+    Returns:
+        List of (module, self_us, cumulative_us, depth) tuples
+    """
+    env = dict(os.environ, DETECTOR_WORKERS="0")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        raise SystemExit(proc.stderr)
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile backend import time")
+    parser.add_argument("--module", default="main", help="module to import (default: main)")
+    parser.add_argument("--top", type=int, default=20, help="rows to show")
+    args = parser.parse_args()
+
+    rows = profile_imports(args.module)
+    total = next((cum for name, _, cum, _ in rows if name == args.module), 0)
+
+    # Top-level packages (depth 1 under the target) show which subsystem costs what
+    print(f"import {args.module}: {total / 1000:.1f} ms total\n")
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for name, self_us, cum_us, _ in sorted(rows, key=lambda r: r[2], reverse=True)[:args.top]:
+        print(f"{cum_us / 1000:>14.1f} {self_us / 1000:>9.1f}  {name}")
+
+    heavy = ("newspaper", "reportlab", "bs4", "PIL", "httpx", "lxml", "nltk")
+    loaded = sorted({name.split(".")[0] for name, *_ in rows if name.split(".")[0] in heavy})
+    print(f"\nHeavy dependencies loaded at import: {', '.join(loaded) if loaded else 'none'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Startup Benchmark
+Measures how long a fresh API worker takes to import and to serve its first request
+
+Usage (from backend/):
+    python -m benchmarks.startup_bench --runs 5
+    python -m benchmarks.startup_bench --detector-workers default
+
+By default both the shipped configuration (one detector worker per CPU,
+spawned and warmed by the lifespan before the first request) and inline
+detectors (DETECTOR_WORKERS=0) are measured, so the pool's share of
+start-up is visible.
+"""
+import os
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+
+from typing import Tuple
+
+import httpx
+
+from loadtest.run import _free_port
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Prints import wall time and peak RSS (KiB) of a bare `import main`
+IMPORT_PROBE = (
+    "import time, resource; t = time.perf_counter(); import main; "
+    "print(time.perf_counter() - t, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)"
+)
+
+
+def measure_import(env) -> Tuple[float, int]:
+    out = subprocess.run(
+        [sys.executable, "-c", IMPORT_PROBE],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+    ).stdout.split()
+    return float(out[0]), int(out[1])
+
+
+def measure_first_response(env, timeout: float = 60.0) -> float:
+    """Seconds from spawning uvicorn until GET / returns 200"""
+    port = _free_port()
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            try:
+                if httpx.get(f"http://127.0.0.1:{port}/", timeout=0.5).status_code == 200:
+                    return time.perf_counter() - start
+            except httpx.HTTPError:
+                time.sleep(0.02)
+        raise RuntimeError("API did not become ready in time")
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+
+def bench(workers: str, runs: int):
+    env = dict(os.environ)
+    if workers == "default":
+        # What a deployment gets: DETECTOR_WORKERS unset, one worker per CPU
+        env.pop("DETECTOR_WORKERS", None)
+        label = f"default ({os.cpu_count() or 1} detector workers)"
+    else:
+        env["DETECTOR_WORKERS"] = workers
+        label = f"DETECTOR_WORKERS={workers}"
+
+    imports, rss, ready = [], [], []
+    for _ in range(runs):
+        seconds, max_rss = measure_import(env)
+        imports.append(seconds)
+        rss.append(max_rss)
+        ready.append(measure_first_response(env))
+
+    print(f"{label}, runs: {runs}")
+    print(f"  import main:        median {statistics.median(imports) * 1000:7.1f} ms   min {min(imports) * 1000:7.1f} ms")
+    print(f"  peak RSS at import: median {statistics.median(rss) / 1024:7.1f} MiB")
+    print(f"  first 200 on GET /: median {statistics.median(ready) * 1000:7.1f} ms   min {min(ready) * 1000:7.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark backend cold start")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--detector-workers", default="default,0",
+                        help="Comma-separated DETECTOR_WORKERS values to measure; 'default' leaves it unset "
+                             "(pool spawn and warm-up are part of start-up)")
+    args = parser.parse_args()
+
+    for workers in args.detector_workers.split(","):
+        bench(workers.strip(), args.runs)
+
+
+if __name__ == "__main__":
+    main()
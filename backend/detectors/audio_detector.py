@@ -16,6 +16,9 @@ class AudioDetector:
     TTS detection, and phoneme-level consistency checking.
     """
     
+    # Bump when detection heuristics change (invalidates cached results)
+    VERSION = "1.0.0"
+    
     def detect(self, audio_path: str, metadata: Dict[str, Any] = None) -> List[Dict[str, Any]]:
         """
         Analyze audio and return list of detected signals.
@@ -0,0 +1,186 @@
+"""
+Detector Executor
+Runs detectors in a process pool so CPU-bound analysis never blocks the event loop
+"""
+import os
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Any, Optional, Callable, Awaitable
+
+from metrics import track_stage
+
+
+# Number of worker processes (0 runs detectors in a thread of the main process)
+DETECTOR_WORKERS = int(os.getenv("DETECTOR_WORKERS", str(os.cpu_count() or 1)))
+
+# How often to check whether the client is still connected (seconds)
+DISCONNECT_POLL_INTERVAL = float(os.getenv("DETECTOR_DISCONNECT_POLL", "0.5"))
+
+# Detectors pre-loaded in each worker process
+_worker_detectors: Dict[str, Any] = {}
+
+
+class ClientDisconnected(Exception):
+    """Raised when the requesting client goes away before detection finishes"""
+
+
+def _load_detectors() -> Dict[str, Any]:
+    from detectors.image_detector import ImageDetector
+    from detectors.video_detector import VideoDetector
+    from detectors.audio_detector import AudioDetector
+    from detectors.text_detector import TextDetector
+
+    return {
+        'image': ImageDetector(),
+        'video': VideoDetector(),
+        'audio': AudioDetector(),
+        'text': TextDetector()
+    }
+
+
+def _init_worker():
+    """Process initializer: import and instantiate every detector once"""
+    global _worker_detectors
+    _worker_detectors = _load_detectors()
+
+    # Detectors import their heavy dependencies lazily; pay for that at start-up
+    # in the worker rather than on its first request
+    import PIL.Image  # noqa: F401
+
+
+def _warm_up() -> int:
+    return os.getpid()
+
+
+def _run_detector(modality: str, target: str, metadata: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return _worker_detectors[modality].detect(target, metadata)
+
+
+class DetectorExecutor:
+    """
+    Dispatches detector runs to a pool of worker processes.
+
+    Each worker imports and instantiates the detectors once at start-up, so a
+    request only pays for the analysis itself. Throughput scales with cores,
+    and a long video analysis occupies one worker instead of the event loop.
+
+    Abandoning a request (cancellation or client disconnect) only removes its
+    job if no worker has picked it up yet; a detector that is already running
+    finishes in its worker and the result is discarded.
+    """
+
+    def __init__(self, max_workers: int = DETECTOR_WORKERS):
+        self.max_workers = max_workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._starting: Optional[asyncio.Future] = None
+        self.in_flight = 0
+
+    def start(self):
+        """Create the pool and spawn every worker up front"""
+        if self._pool is not None:
+            return
+
+        if self.max_workers <= 0:
+            # Inline mode: detectors run in the default thread pool
+            _init_worker()
+            return
+
+        start_method = os.getenv("DETECTOR_START_METHOD", "spawn")
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context(start_method),
+            initializer=_init_worker
+        )
+        for future in [self._pool.submit(_warm_up) for _ in range(self.max_workers)]:
+            future.result()
+
+    def shutdown(self):
+        """Stop the workers, dropping queued work"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def _start_in_background(self) -> asyncio.Future:
+        # Spawning and warming workers takes seconds; do it in a thread, once for all callers
+        if self._starting is None:
+            self._starting = asyncio.ensure_future(asyncio.to_thread(self.start))
+            self._starting.add_done_callback(self._started)
+        return self._starting
+
+    def _replace_broken(self, pool: Optional[ProcessPoolExecutor]):
+        # A worker died (e.g. OOM on a huge file). Every job on the broken pool
+        # ends up here; only the first replaces it, without blocking the event loop.
+        if pool is not None and self._pool is pool:
+            self.shutdown()
+            self._start_in_background()
+
+    def _started(self, future: asyncio.Future):
+        self._starting = None
+        if not future.cancelled():
+            # Waiters re-raise it; retrieve it here too in case none are left
+            future.exception()
+
+    async def detect(
+        self,
+        modality: str,
+        target: str,
+        metadata: Optional[Dict[str, Any]] = None,
+        is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Run the detector for a modality off the event loop.
+
+        Args:
+            modality: Type of media (image, video, audio, text)
+            target: File path (or text content for the text detector)
+            metadata: Optional context (source, timestamp, etc.)
+            is_disconnected: Optional coroutine function reporting client disconnect
+
+        Returns:
+            List of signal dictionaries from the detector
+
+        Raises:
+            ClientDisconnected: If the client disconnected before the result was ready
+            BrokenProcessPool: If a worker died; a replacement pool starts in the background
+        """
+        if self._pool is None and not _worker_detectors:
+            await asyncio.shield(self._start_in_background())
+
+        pool = self._pool
+        loop = asyncio.get_running_loop()
+        try:
+            future = loop.run_in_executor(pool, _run_detector, modality, target, metadata)
+        except BrokenProcessPool:
+            self._replace_broken(pool)
+            raise
+        self.in_flight += 1
+
+        try:
+            with track_stage(f"detect_{modality}"):
+                if is_disconnected is None:
+                    return await future
+
+                while True:
+                    done, _ = await asyncio.wait({future}, timeout=DISCONNECT_POLL_INTERVAL)
+                    if done:
+                        return future.result()
+                    if await is_disconnected():
+                        raise ClientDisconnected()
+
+        except (asyncio.CancelledError, ClientDisconnected):
+            # Drops the job if a worker has not picked it up yet; a running detector can't be stopped
+            future.cancel()
+            raise
+
+        except BrokenProcessPool:
+            self._replace_broken(pool)
+            raise
+
+        finally:
+            self.in_flight -= 1
+
+
+# Global instance
+detector_executor = DetectorExecutor()
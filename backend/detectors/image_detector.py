@@ -3,7 +3,6 @@ Image Detector Module
 Analyzes images for manipulation artifacts, metadata inconsistencies, and visual anomalies
 """
 from typing import Dict, List, Any
-from PIL import Image
 import os
 import hashlib
 import sys
@@ -19,6 +18,9 @@ class ImageDetector:
     In production, would integrate CNNs for tampering detection.
     """
     
+    # Bump when detection heuristics change (invalidates cached results)
+    VERSION = "1.0.0"
+    
     def detect(self, image_path: str, metadata: Dict[str, Any] = None) -> List[Dict[str, Any]]:
         """
         Analyze image and return list of detected signals.
@@ -33,6 +35,9 @@ class ImageDetector:
         signals = []
         
         try:
+            # Imported on first use so processes that never analyze images skip PIL
+            from PIL import Image
+            
             with Image.open(image_path) as img:
                 # Signal 1: Check image dimensions and aspect ratio
                 width, height = img.size
@@ -20,6 +20,9 @@ class TextDetector:
     fact-checking APIs, and stylometric analysis.
     """
     
+    # Bump when detection heuristics change (invalidates cached results)
+    VERSION = "1.0.0"
+    
     # Sensational language indicators
     SENSATIONAL_KEYWORDS = [
         'shocking', 'unbelievable', 'breaking', 'urgent', 'must see',
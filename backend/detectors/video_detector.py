@@ -16,6 +16,9 @@ class VideoDetector:
     optical flow analysis, and audio-visual sync verification.
     """
     
+    # Bump when detection heuristics change (invalidates cached results)
+    VERSION = "1.0.0"
+    
     def detect(self, video_path: str, metadata: Dict[str, Any] = None) -> List[Dict[str, Any]]:
         """
         Analyze video and return list of detected signals.
@@ -3,31 +3,341 @@ Gemini API Client
 Integrates with deployed Gemini API for advanced analysis and verification
 """
 import os
-import httpx
-from typing import Dict, Any, Optional
+import re
+import time
+import asyncio
+import hashlib
+from typing import Dict, Any, Optional, List, Tuple, Callable, Awaitable
 import json
 from dotenv import load_dotenv
 
+from metrics import track_stage, CIRCUIT_STATE, UPSTREAM_HEALTHY
+from tools.cache import TieredCache
+from tools.singleflight import SingleFlight
+
 # Load environment variables
 load_dotenv()
 
 
+MEDIA_RISK_PROMPT = """Analyze this {modality} content for deception risk.
+
+Detected Signals:
+{signal_summary}
+
+Source: {source}
+Context: {context}
+
+Please provide:
+1. Overall risk assessment (Low/Medium/High)
+2. 3-4 additional risk factors not covered by the signals
+3. Contextual red flags based on source and timing
+4. Confidence level in your assessment
+
+Keep response concise and factual. Focus on verifiable risk indicators."""
+
+TEXT_VERIFY_PROMPT = """Analyze this text for misinformation risk indicators:
+
+Text: "{text}..."
+
+Source: {source}
+
+Identify:
+1. Factual claims that can be verified
+2. Emotional manipulation techniques
+3. Logical fallacies or misleading framing
+4. Credibility red flags
+5. Risk score (0-100) with reasoning
+
+Be objective and evidence-based."""
+
+# Fingerprint of the prompt templates; editing a template invalidates cached responses
+PROMPT_VERSION = hashlib.sha256(
+    (MEDIA_RISK_PROMPT + TEXT_VERIFY_PROMPT).encode('utf-8')
+).hexdigest()[:12]
+
+
+def build_prompt_cache_key(kind: str, prompt: str) -> str:
+    """
+    Build the cache key for a rendered prompt.
+
+    Whitespace is collapsed so prompts differing only in formatting share an
+    entry; the template fingerprint keeps old responses from being reused
+    after a prompt change.
+
+    Args:
+        kind: Prompt family (media_risk, text_verify)
+        prompt: Fully rendered prompt text
+
+    Returns:
+        Opaque cache key string
+    """
+    normalized = re.sub(r'\s+', ' ', prompt).strip()
+    digest = hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+    return f"{kind}:{PROMPT_VERSION}:{digest}"
+
+
+class CircuitBreaker:
+    """
+    Closed/open/half-open circuit breaker driven by real call outcomes.
+    
+    After `failure_threshold` consecutive failures the circuit opens and calls
+    fail fast. Once `reset_timeout` seconds have passed a single trial call is
+    let through (half-open): success closes the circuit, failure re-opens it.
+    """
+    
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+    
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = 0.0
+        self._state = self.CLOSED
+        self._trial_in_flight = False
+    
+    @property
+    def state(self) -> str:
+        """Current state; an open circuit past its reset timeout reports half-open"""
+        if self._state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self._state
+    
+    def can_attempt(self) -> bool:
+        """Whether a call could be let through right now (no side effects)"""
+        state = self.state
+        return state == self.CLOSED or (state == self.HALF_OPEN and not self._trial_in_flight)
+    
+    def allow_request(self) -> bool:
+        """Claim permission for one call; in half-open only a single trial is allowed"""
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and not self._trial_in_flight:
+            self._state = self.HALF_OPEN
+            self._trial_in_flight = True
+            return True
+        return False
+    
+    def release_trial(self):
+        """Give up a claimed half-open trial without an outcome (e.g. the call was cancelled)"""
+        self._trial_in_flight = False
+    
+    def record_success(self):
+        self.failures = 0
+        self._trial_in_flight = False
+        self._state = self.CLOSED
+    
+    def record_failure(self):
+        self.failures += 1
+        self._trial_in_flight = False
+        if self._state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            self._state = self.OPEN
+            self.opened_at = time.monotonic()
+
+
+class BatchUnsupported(Exception):
+    """The proxy has no batch endpoint"""
+
+
+class PromptBatcher:
+    """
+    Micro-batching of concurrent prompts into multi-item proxy requests.
+    
+    Prompts submitted within `window` seconds of each other (or until
+    `max_size` are waiting) are sent as one batch and the results are fanned
+    back out to their callers. If the proxy turns out not to support
+    batching, the current batch is retried item by item and batching is
+    switched off for the rest of the process.
+    """
+    
+    def __init__(
+        self,
+        send_batch: Callable[[List[str]], Awaitable[List[Optional[str]]]],
+        send_one: Callable[[str], Awaitable[Optional[str]]],
+        window: float = 0.005,
+        max_size: int = 16
+    ):
+        self.send_batch = send_batch
+        self.send_one = send_one
+        self.window = window
+        self.max_size = max_size
+        self.supported = True
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: set = set()
+    
+    @property
+    def enabled(self) -> bool:
+        return self.supported and self.window > 0 and self.max_size > 1
+    
+    async def submit(self, prompt: str) -> Optional[str]:
+        """Queue a prompt for the next batch and wait for its response"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((prompt, future))
+        
+        if len(self._pending) >= self.max_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        
+        return await future
+    
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        
+        # Detached so a caller being cancelled doesn't take the batch down with it
+        task = asyncio.create_task(self._send(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+    
+    async def _send(self, batch: List[Tuple[str, asyncio.Future]]):
+        batch = [(prompt, future) for prompt, future in batch if not future.done()]
+        if not batch:
+            return
+        prompts = [prompt for prompt, _ in batch]
+        
+        try:
+            if len(batch) == 1:
+                results = [await self.send_one(prompts[0])]
+            else:
+                try:
+                    results = await self.send_batch(prompts)
+                except BatchUnsupported:
+                    if self.supported:
+                        print("Gemini proxy has no batch endpoint; sending prompts individually")
+                    self.supported = False
+                    results = await asyncio.gather(
+                        *(self.send_one(prompt) for prompt in prompts),
+                        return_exceptions=True
+                    )
+        except Exception as e:
+            results = [e] * len(batch)
+        
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+
 class GeminiClient:
     """Client for interacting with Gemini API on Render"""
     
     def __init__(self):
         self.base_url = os.getenv("GEMINI_API_URL", "")
-        self.timeout = 30.0
+        self.connect_timeout = float(os.getenv("GEMINI_CONNECT_TIMEOUT", "5"))
+        self.timeout = float(os.getenv("GEMINI_READ_TIMEOUT", "30"))
+        self.health_timeout = 5.0
+        self.max_connections = int(os.getenv("GEMINI_MAX_CONNECTIONS", "20"))
+        self.max_keepalive = int(os.getenv("GEMINI_MAX_KEEPALIVE", "10"))
+        self.keepalive_expiry = float(os.getenv("GEMINI_KEEPALIVE_EXPIRY", "60"))
+        self.http2 = os.getenv("GEMINI_HTTP2", "false").lower() in ("1", "true", "yes")
+        self._client = None
+        self.health_interval = float(os.getenv("GEMINI_HEALTH_INTERVAL", "15"))
+        self.breaker = CircuitBreaker(
+            failure_threshold=int(os.getenv("GEMINI_BREAKER_FAILURES", "5")),
+            reset_timeout=float(os.getenv("GEMINI_BREAKER_RESET", "30"))
+        )
+        # Optimistic until the first probe says otherwise
+        self.healthy = True
+        self.last_probe_at: Optional[float] = None
+        self._probe_task: Optional[asyncio.Task] = None
+        self._inflight = SingleFlight("gemini_generate")
+        self._batcher = PromptBatcher(
+            send_batch=self._generate_batch,
+            send_one=self._generate_one,
+            window=float(os.getenv("GEMINI_BATCH_WINDOW_MS", "5")) / 1000,
+            max_size=int(os.getenv("GEMINI_BATCH_MAX", "16"))
+        )
+        
+        CIRCUIT_STATE.labels('gemini').set_function(
+            lambda: {'closed': 0, 'half_open': 1, 'open': 2}[self.breaker.state]
+        )
+        UPSTREAM_HEALTHY.labels('gemini').set_function(lambda: 1 if self.is_available() else 0)
         
+    def get_client(self) -> "httpx.AsyncClient":
+        """Return the long-lived pooled client, creating it on first use"""
+        if self._client is None or self._client.is_closed:
+            import httpx
+
+            http2 = self.http2
+            if http2:
+                try:
+                    import h2  # noqa: F401 - httpx needs it for HTTP/2
+                except ImportError:
+                    print("GEMINI_HTTP2 is set but the h2 package is not installed; using HTTP/1.1")
+                    http2 = False
+
+            self._client = httpx.AsyncClient(
+                http2=http2,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive,
+                    keepalive_expiry=self.keepalive_expiry
+                ),
+                timeout=httpx.Timeout(self.timeout, connect=self.connect_timeout)
+            )
+        return self._client
+    
+    async def close(self):
+        """Close the pooled client (called on application shutdown)"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
     def is_available(self) -> bool:
-        """Check if Gemini API is configured and reachable"""
+        """Check if Gemini API is configured and reachable (memory read, never blocks)"""
         if not self.base_url:
             return False
-        try:
-            response = httpx.get(f"{self.base_url}/health", timeout=5.0)
-            return response.status_code == 200
-        except:
+        return self.healthy and self.breaker.can_attempt()
+    
+    async def probe_health(self) -> bool:
+        """Hit the /health endpoint once and record the outcome"""
+        if not self.base_url:
             return False
+        try:
+            import httpx
+            
+            with track_stage("gemini_health"):
+                response = await self.get_client().get(
+                    f"{self.base_url}/health",
+                    timeout=httpx.Timeout(self.health_timeout, connect=self.connect_timeout)
+                )
+            self.healthy = response.status_code == 200
+        except Exception:
+            self.healthy = False
+        self.last_probe_at = time.time()
+        return self.healthy
+    
+    def start_health_probe(self):
+        """Start refreshing the health state in the background"""
+        if not self.base_url or self._probe_task is not None:
+            return
+        self._probe_task = asyncio.create_task(self._probe_loop())
+    
+    async def stop_health_probe(self):
+        if self._probe_task is not None:
+            self._probe_task.cancel()
+            try:
+                await self._probe_task
+            except asyncio.CancelledError:
+                pass
+            self._probe_task = None
+    
+    async def _probe_loop(self):
+        while True:
+            await self.probe_health()
+            await asyncio.sleep(self.health_interval)
     
     async def generate(self, prompt: str) -> Optional[str]:
         """
@@ -37,30 +347,79 @@ class GeminiClient:
             prompt: Text prompt to send
             
         Returns:
-            Generated text response or None if failed
+            Generated text response or None if failed (or the circuit is open)
         """
         if not self.base_url:
             return None
+        
+        # Concurrent callers with the same prompt share one upstream call
+        return await self._inflight.do(SingleFlight.key(prompt), lambda: self._generate(prompt))
+    
+    async def _generate(self, prompt: str) -> Optional[str]:
+        # Fail fast while the backend is known to be down
+        if not self.breaker.allow_request():
+            return None
             
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.base_url}/generate",
-                    json={"text": prompt},
-                    timeout=self.timeout
-                )
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    # Extract text from response (adapt based on your API response format)
-                    if isinstance(result, dict):
-                        return result.get("text") or result.get("response") or str(result)
-                    return str(result)
-                return None
+            if self._batcher.enabled:
+                return await self._batcher.submit(prompt)
+            return await self._generate_one(prompt)
+        except asyncio.CancelledError:
+            self.breaker.release_trial()
+            raise
         except Exception as e:
             print(f"Gemini API error: {str(e)}")
             return None
     
+    async def _generate_one(self, prompt: str) -> Optional[str]:
+        """POST a single prompt to /generate"""
+        response = await self._post("/generate", {"text": prompt}, "gemini_generate")
+        if response.status_code != 200:
+            return None
+        return self._response_text(response.json())
+    
+    async def _generate_batch(self, prompts: List[str]) -> List[Optional[str]]:
+        """
+        POST several prompts to /generate/batch in one request
+        
+        The proxy is expected to accept {"texts": [...]} and answer with
+        {"results": [...]} in the same order, each item shaped like a
+        /generate response (or null if that prompt failed).
+        """
+        response = await self._post("/generate/batch", {"texts": prompts}, "gemini_generate_batch")
+        if response.status_code in (404, 405):
+            raise BatchUnsupported()
+        if response.status_code != 200:
+            return [None] * len(prompts)
+        
+        results = response.json().get("results") or []
+        if len(results) != len(prompts):
+            raise ValueError(f"Batch response has {len(results)} results for {len(prompts)} prompts")
+        return [self._response_text(r) if r is not None else None for r in results]
+    
+    async def _post(self, path: str, payload: Dict[str, Any], stage: str):
+        """POST to the proxy, recording the outcome with the circuit breaker"""
+        try:
+            with track_stage(stage):
+                response = await self.get_client().post(f"{self.base_url}{path}", json=payload)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.breaker.record_failure()
+            raise
+        
+        if response.status_code >= 500:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        return response
+    
+    def _response_text(self, result: Any) -> str:
+        # Extract text from response (adapt based on your API response format)
+        if isinstance(result, dict):
+            return result.get("text") or result.get("response") or str(result)
+        return str(result)
+    
     async def analyze_media_risk(
         self, 
         modality: str, 
@@ -78,7 +437,7 @@ class GeminiClient:
         Returns:
             Gemini analysis with risk factors and additional signals
         """
-        if not self.is_available():
+        if not self.base_url:
             return None
         
         # Build prompt for Gemini
@@ -90,23 +449,14 @@ class GeminiClient:
         source = metadata.get('source', 'Unknown')
         context = metadata.get('context', 'No context provided')
         
-        prompt = f"""Analyze this {modality} content for deception risk.
-
-Detected Signals:
-{signal_summary}
-
-Source: {source}
-Context: {context}
-
-Please provide:
-1. Overall risk assessment (Low/Medium/High)
-2. 3-4 additional risk factors not covered by the signals
-3. Contextual red flags based on source and timing
-4. Confidence level in your assessment
+        prompt = MEDIA_RISK_PROMPT.format(
+            modality=modality,
+            signal_summary=signal_summary,
+            source=source,
+            context=context
+        )
 
-Keep response concise and factual. Focus on verifiable risk indicators."""
-
-        response = await self.generate(prompt)
+        response = await self._cached_generate('media_risk', prompt)
         
         if not response:
             return None
@@ -129,27 +479,14 @@ Keep response concise and factual. Focus on verifiable risk indicators."""
         Returns:
             Gemini verification results
         """
-        if not self.is_available():
+        if not self.base_url:
             return None
         
         source = metadata.get('source', 'Unknown')
         
-        prompt = f"""Analyze this text for misinformation risk indicators:
-
-Text: "{text[:500]}..."
-
-Source: {source}
-
-Identify:
-1. Factual claims that can be verified
-2. Emotional manipulation techniques
-3. Logical fallacies or misleading framing
-4. Credibility red flags
-5. Risk score (0-100) with reasoning
+        prompt = TEXT_VERIFY_PROMPT.format(text=text[:500], source=source)
 
-Be objective and evidence-based."""
-
-        response = await self.generate(prompt)
+        response = await self._cached_generate('text_verify', prompt)
         
         if not response:
             return None
@@ -159,6 +496,30 @@ Be objective and evidence-based."""
             "gemini_verified": True
         }
     
+    async def _cached_generate(self, kind: str, prompt: str) -> Optional[str]:
+        """
+        generate() behind the prompt-response cache
+        
+        Args:
+            kind: Prompt family, part of the cache key
+            prompt: Rendered prompt
+            
+        Returns:
+            Cached or freshly generated response, or None if unavailable
+        """
+        key = build_prompt_cache_key(kind, prompt)
+        cached = prompt_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        if not self.is_available():
+            return None
+        
+        response = await self.generate(prompt)
+        if response:
+            prompt_cache.set(key, response)
+        return response
+    
     def _extract_risk_factors(self, gemini_response: str) -> list:
         """
         Extract structured risk factors from Gemini's text response
@@ -190,5 +551,12 @@ Be objective and evidence-based."""
         return risk_factors[:4]  # Return up to 4 factors
 
 
-# Global instance
+# Global instances
+prompt_cache = TieredCache(
+    name="gemini_prompts",
+    ttl=float(os.getenv("GEMINI_CACHE_TTL_SECONDS", str(7 * 86400))),
+    max_memory_items=int(os.getenv("GEMINI_CACHE_MEMORY_ITEMS", "1024")),
+    max_disk_bytes=int(os.getenv("GEMINI_CACHE_MAX_MB", "64")) * 1024 * 1024,
+    compress=True
+)
 gemini_client = GeminiClient()
@@ -0,0 +1,230 @@
+"""
+Job Manager
+Bounded background job queue with worker concurrency limits and progress events
+"""
+import os
+import time
+import uuid
+import asyncio
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Callable, Awaitable, AsyncIterator
+
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+JOB_QUEUE_SIZE = int(os.getenv("JOB_QUEUE_SIZE", "100"))
+JOB_RETENTION_SECONDS = float(os.getenv("JOB_RETENTION_SECONDS", "3600"))
+JOB_MAX_STORED = int(os.getenv("JOB_MAX_STORED", "5000"))
+
+TERMINAL_STATUSES = ('completed', 'failed')
+
+
+class QueueFull(Exception):
+    """Raised when the job queue cannot accept more work"""
+
+
+class Job:
+    """
+    A unit of background work and its progress history.
+
+    Every state change is appended to `events`, so pollers see the latest
+    snapshot and event subscribers can replay from the beginning.
+    """
+
+    def __init__(self, kind: str):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.status = 'queued'
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.events = []
+        self._changed = asyncio.Event()
+        self.emit('queued')
+
+    @property
+    def finished(self) -> bool:
+        return self.status in TERMINAL_STATUSES
+
+    def emit(self, stage: str, **data):
+        """
+        Record a progress event and wake subscribers.
+
+        Args:
+            stage: Name of the stage that completed (or lifecycle state)
+            **data: JSON-serializable details about the stage
+        """
+        self.events.append({'stage': stage, 'at': time.time(), **data})
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'job_id': self.id,
+            'kind': self.kind,
+            'status': self.status,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'stages': [e['stage'] for e in self.events],
+            'result': self.result,
+            'error': self.error
+        }
+
+
+class JobManager:
+    """
+    Runs submitted jobs on a fixed number of workers behind a bounded queue.
+
+    Submission never blocks: when the queue is full the caller gets QueueFull
+    and can shed load (503) instead of holding the connection open.
+    """
+
+    def __init__(
+        self,
+        workers: int = JOB_WORKERS,
+        max_queue: int = JOB_QUEUE_SIZE,
+        retention: float = JOB_RETENTION_SECONDS
+    ):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.retention = retention
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks = []
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self.running = 0
+
+    async def start(self):
+        """Create the queue and worker tasks"""
+        if self._queue is not None:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        """Cancel workers and discard queued jobs"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+        if self._queue is not None:
+            while not self._queue.empty():
+                job, _, cleanup = self._queue.get_nowait()
+                job.status = 'failed'
+                job.error = 'Server shutting down'
+                job.emit('failed', error=job.error)
+                self._run_cleanup(cleanup)
+            self._queue = None
+
+    def submit(
+        self,
+        kind: str,
+        runner: Callable[[Job], Awaitable[Any]],
+        cleanup: Optional[Callable[[], None]] = None
+    ) -> Job:
+        """
+        Queue a job for background execution.
+
+        Args:
+            kind: Job type label (e.g. fact_check, image)
+            runner: Coroutine function receiving the Job; its return value is the result
+            cleanup: Optional callback run once the job is finished or discarded
+
+        Returns:
+            The queued Job
+
+        Raises:
+            QueueFull: If the queue is at capacity
+        """
+        if self._queue is None:
+            raise QueueFull("Job queue is not running")
+
+        self._prune()
+
+        job = Job(kind)
+        try:
+            self._queue.put_nowait((job, runner, cleanup))
+        except asyncio.QueueFull:
+            raise QueueFull("Job queue is full")
+
+        self._jobs[job.id] = job
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    async def stream_events(self, job: Job) -> AsyncIterator[Dict[str, Any]]:
+        """Yield every event of a job (past and future) until it finishes"""
+        index = 0
+        while True:
+            changed = job._changed
+            while index < len(job.events):
+                yield job.events[index]
+                index += 1
+            if job.finished:
+                return
+            await changed.wait()
+
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'workers': self.workers,
+            'running': self.running,
+            'queued': self.queue_depth(),
+            'max_queue': self.max_queue,
+            'stored': len(self._jobs)
+        }
+
+    async def _worker(self):
+        while True:
+            job, runner, cleanup = await self._queue.get()
+            self.running += 1
+            job.status = 'running'
+            job.started_at = time.time()
+            job.emit('started')
+
+            try:
+                job.result = await runner(job)
+                job.status = 'completed'
+                job.finished_at = time.time()
+                job.emit('completed', result=job.result)
+            except asyncio.CancelledError:
+                job.status = 'failed'
+                job.error = 'Job cancelled'
+                job.finished_at = time.time()
+                job.emit('failed', error=job.error)
+                raise
+            except Exception as e:
+                job.status = 'failed'
+                job.error = str(e)
+                job.finished_at = time.time()
+                job.emit('failed', error=job.error)
+            finally:
+                self.running -= 1
+                self._run_cleanup(cleanup)
+                self._queue.task_done()
+
+    def _prune(self):
+        """Forget finished jobs past retention, and the oldest ones beyond the cap"""
+        cutoff = time.time() - self.retention
+        for job_id in list(self._jobs):
+            job = self._jobs[job_id]
+            expired = job.finished and job.finished_at < cutoff
+            if expired or (len(self._jobs) >= JOB_MAX_STORED and job.finished):
+                del self._jobs[job_id]
+
+    def _run_cleanup(self, cleanup: Optional[Callable[[], None]]):
+        if cleanup is None:
+            return
+        try:
+            cleanup()
+        except Exception as e:
+            print(f"Job cleanup error: {e}")
+
+
+# Global instance
+job_manager = JobManager()
@@ -0,0 +1,3 @@
+"""
+Load-test harness: local upstream stand-ins and an open-loop load generator
+"""
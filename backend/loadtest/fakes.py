@@ -0,0 +1,216 @@
+"""
+Fake Upstreams
+Local stand-ins for Ollama, the Gemini proxy and DuckDuckGo HTML with tunable latency and errors
+
+Run standalone:
+    python -m loadtest.fakes --port 9100 --ollama-latency 0.8 --gemini-error-rate 0.05
+"""
+import json
+import zlib
+import random
+import asyncio
+import argparse
+from typing import Dict, Any
+
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
+
+
+CLAIM_RESPONSE = json.dumps([
+    {"type": "health", "claim": "A new study says drinking coffee cures cancer"},
+    {"type": "event", "claim": "The city council approved the new metro line"}
+])
+
+GEMINI_RESPONSE = """1. Overall risk assessment: Medium
+2. Source provenance cannot be independently established
+3. Signal pattern is consistent with re-encoded social media content
+4. Timing coincides with a known misinformation campaign
+- Confidence level: moderate"""
+
+ARTICLE_SENTENCES = [
+    "The city council approved the new metro line on Tuesday after a lengthy debate.",
+    "Officials said construction would begin next spring and take four years.",
+    "Researchers cautioned that no study shows drinking coffee cures cancer.",
+    "Local residents expressed mixed feelings about the cost of the project.",
+    "The ministry of health published updated guidance for hospitals this week."
+]
+
+
+class UpstreamProfile:
+    """Latency/error behaviour of one fake upstream"""
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+
+    async def delay(self):
+        wait = self.latency + random.uniform(-self.jitter, self.jitter)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def should_fail(self) -> bool:
+        return random.random() < self.error_rate
+
+
+def create_fake_app(
+    profiles: Dict[str, UpstreamProfile],
+    base_url: str,
+    gemini_batch: bool = True
+) -> FastAPI:
+    """
+    Build one app serving every fake upstream.
+
+    Args:
+        profiles: UpstreamProfile per upstream (ollama, gemini, search, article)
+        base_url: Public URL of this server, used for links in search results
+        gemini_batch: Serve the Gemini proxy's /generate/batch endpoint
+
+    Returns:
+        FastAPI application
+    """
+    app = FastAPI(title="MDRS fake upstreams")
+    counters: Dict[str, int] = {name: 0 for name in profiles}
+
+    # --- Ollama ---------------------------------------------------------
+
+    @app.post("/api/generate")
+    async def ollama_generate(request: Request):
+        counters['ollama'] += 1
+        body = await request.json()
+        profile = profiles['ollama']
+        await profile.delay()
+        if profile.should_fail():
+            return JSONResponse(status_code=500, content={"error": "model overloaded"})
+
+        prompt = body.get("prompt", "")
+        if "information extraction" in prompt:
+            text = CLAIM_RESPONSE
+        else:
+            text = "The claims could not be confirmed by the retrieved sources."
+
+        if not body.get("stream", True):
+            return {"model": body.get("model"), "response": text, "done": True}
+
+        async def chunks():
+            # NDJSON token stream, like Ollama with "stream": true
+            for word in text.split(" "):
+                yield json.dumps({"model": body.get("model"), "response": word + " ", "done": False}) + "\n"
+                await asyncio.sleep(0.01)
+            yield json.dumps({"model": body.get("model"), "response": "", "done": True}) + "\n"
+
+        return StreamingResponse(chunks(), media_type="application/x-ndjson")
+
+    # --- Gemini proxy ---------------------------------------------------
+
+    @app.get("/health")
+    async def gemini_health():
+        counters['gemini'] += 1
+        profile = profiles['gemini']
+        if profile.should_fail():
+            return JSONResponse(status_code=503, content={"status": "unavailable"})
+        return {"status": "ok"}
+
+    @app.post("/generate")
+    async def gemini_generate(request: Request):
+        counters['gemini'] += 1
+        await request.json()
+        profile = profiles['gemini']
+        await profile.delay()
+        if profile.should_fail():
+            return JSONResponse(status_code=502, content={"error": "upstream error"})
+        return {"text": GEMINI_RESPONSE}
+
+    async def gemini_generate_batch(request: Request):
+        counters['gemini'] += 1
+        body = await request.json()
+        profile = profiles['gemini']
+        await profile.delay()
+        if profile.should_fail():
+            return JSONResponse(status_code=502, content={"error": "upstream error"})
+        return {"results": [{"text": GEMINI_RESPONSE} for _ in body.get("texts", [])]}
+
+    if gemini_batch:
+        app.post("/generate/batch")(gemini_generate_batch)
+
+    # --- DuckDuckGo HTML and article pages ------------------------------
+
+    @app.post("/html/")
+    async def search(request: Request):
+        counters['search'] += 1
+        form = await request.form()
+        profile = profiles['search']
+        await profile.delay()
+        if profile.should_fail():
+            return HTMLResponse(status_code=503, content="<html>rate limited</html>")
+
+        seed = zlib.crc32(form.get("q", "").encode("utf-8")) % 1000
+        links = "".join(
+            f'<div class="result"><a class="result__a" href="{base_url}/article/{seed + i}">'
+            f'Result {i}</a></div>'
+            for i in range(5)
+        )
+        return HTMLResponse(f"<html><body>{links}</body></html>")
+
+    @app.get("/article/{article_id}")
+    async def article(article_id: int, request: Request):
+        counters['article'] += 1
+        profile = profiles['article']
+        await profile.delay()
+        if profile.should_fail():
+            return HTMLResponse(status_code=500, content="<html>error</html>")
+
+        # Articles never change, so conditional requests always revalidate
+        etag = f'"article-{article_id}"'
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+
+        rng = random.Random(article_id)
+        paragraphs = "".join(
+            f"<p>{' '.join(rng.sample(ARTICLE_SENTENCES, 3))}</p>" for _ in range(6)
+        )
+        return HTMLResponse(
+            f"<html><head><title>Article {article_id}</title></head>"
+            f"<body><article><h1>Article {article_id}</h1>{paragraphs}</article></body></html>",
+            headers={"ETag": etag}
+        )
+
+    @app.get("/_stats")
+    async def stats() -> Dict[str, Any]:
+        return counters
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run local fake upstreams for load testing")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    for name, latency in (("ollama", 0.5), ("gemini", 0.3), ("search", 0.2), ("article", 0.1)):
+        parser.add_argument(f"--{name}-latency", type=float, default=latency, help="seconds")
+        parser.add_argument(f"--{name}-jitter", type=float, default=latency / 4, help="seconds")
+        parser.add_argument(f"--{name}-error-rate", type=float, default=0.0, help="0.0-1.0")
+    parser.add_argument("--no-gemini-batch", action="store_true",
+                        help="behave like a Gemini proxy without /generate/batch")
+    args = parser.parse_args()
+
+    profiles = {
+        name: UpstreamProfile(
+            latency=getattr(args, f"{name}_latency"),
+            jitter=getattr(args, f"{name}_jitter"),
+            error_rate=getattr(args, f"{name}_error_rate")
+        )
+        for name in ("ollama", "gemini", "search", "article")
+    }
+
+    import uvicorn
+    app = create_fake_app(
+        profiles,
+        base_url=f"http://{args.host}:{args.port}",
+        gemini_batch=not args.no_gemini_batch
+    )
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,347 @@
+"""
+Load Test Runner
+Starts the API against local fake upstreams and drives every endpoint at a target request rate
+
+Usage (from backend/):
+    python -m loadtest.run --rps 20 --duration 30
+    python -m loadtest.run --scenarios image,text --rps 50 --max-p95-ms 800 --json report.json
+
+Requests are issued open-loop (on a fixed schedule, regardless of how long
+earlier requests take), so queueing delay shows up in the latency
+percentiles instead of silently lowering the offered load. The exit status
+is non-zero when a --max-* threshold is exceeded, which lets CI gate deploys.
+"""
+import os
+import sys
+import json
+import time
+import random
+import socket
+import asyncio
+import argparse
+import subprocess
+from io import BytesIO
+from typing import Dict, Any, List, Callable, Tuple
+
+import httpx
+
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# --- Request payloads ---------------------------------------------------------
+
+def _image_bytes(unique: bool) -> bytes:
+    from PIL import Image
+
+    color = tuple(random.randrange(256) for _ in range(3)) if unique else (200, 30, 30)
+    img = Image.new('RGB', (640, 480), color=color)
+    buffer = BytesIO()
+    img.save(buffer, format='JPEG')
+    return buffer.getvalue()
+
+
+def _container_bytes(header: bytes, size: int, unique: bool) -> bytes:
+    body = os.urandom(size) if unique else b'\x00' * size
+    return header + body
+
+
+def _video_bytes(unique: bool) -> bytes:
+    return _container_bytes(b'\x00\x00\x00\x18ftypmp42\x00\x00\x00\x00', 512 * 1024, unique)
+
+
+def _audio_bytes(unique: bool) -> bytes:
+    return _container_bytes(b'ID3\x04\x00\x00\x00\x00\x00\x00', 128 * 1024, unique)
+
+
+TEXT_SAMPLES = [
+    "BREAKING: A new study says drinking coffee cures cancer, doctors are shocked!",
+    "The city council approved the new metro line, officials confirmed on Tuesday.",
+    "Famous actor died of a mystery illness last night, family hiding the truth.",
+]
+
+
+def build_scenarios(unique_media: bool) -> Dict[str, Callable[[httpx.AsyncClient], Any]]:
+    """Map scenario name to a coroutine function issuing one request"""
+
+    def media(path: str, name: str, mime: str, payload: Callable[[bool], bytes]):
+        async def run(client: httpx.AsyncClient):
+            files = {'file': (name, payload(unique_media), mime)}
+            return await client.post(path, files=files, data={'source': 'Load test'})
+        return run
+
+    async def health(client):
+        return await client.get("/")
+
+    async def page(client):
+        return await client.post("/analyze", json={
+            "url": "https://example.xyz/post",
+            "title": "SHOCKING NEWS YOU MUST SEE",
+            "text": random.choice(TEXT_SAMPLES)
+        })
+
+    async def text(client):
+        return await client.post("/analyze/text", json={"text": random.choice(TEXT_SAMPLES)})
+
+    async def batch(client):
+        files = [
+            ('files', ('a.jpg', _image_bytes(unique_media), 'image/jpeg')),
+            ('files', ('b.mp4', _video_bytes(unique_media), 'video/mp4')),
+            ('files', ('c.mp3', _audio_bytes(unique_media), 'audio/mpeg')),
+        ]
+        response = await client.post("/analyze/batch", files=files)
+        await response.aread()
+        return response
+
+    async def job(client):
+        return await client.post("/jobs", data={"text": random.choice(TEXT_SAMPLES)})
+
+    async def evidence(client):
+        return await client.post("/generate-evidence-pack", json={
+            "text": random.choice(TEXT_SAMPLES),
+            "verdict": "Fake",
+            "claims": [{"signal": "health", "description": "coffee cures cancer"}],
+            "reason": "No credible source confirms the claim."
+        })
+
+    async def complaint(client):
+        return await client.post("/complaint", json={
+            "content": random.choice(TEXT_SAMPLES),
+            "category": "Fake News",
+            "platform": "WhatsApp"
+        })
+
+    async def metrics(client):
+        return await client.get("/metrics")
+
+    return {
+        'health': health,
+        'page': page,
+        'image': media("/analyze/image", "load.jpg", "image/jpeg", _image_bytes),
+        'video': media("/analyze/video", "load.mp4", "video/mp4", _video_bytes),
+        'audio': media("/analyze/audio", "load.mp3", "audio/mpeg", _audio_bytes),
+        'batch': batch,
+        'text': text,
+        'job': job,
+        'evidence': evidence,
+        'complaint': complaint,
+        'metrics': metrics,
+    }
+
+
+# --- Process management -------------------------------------------------------
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_until_up(url: str, timeout: float = 30.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            httpx.get(url, timeout=1.0)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Server at {url} did not start within {timeout}s")
+
+
+def start_fakes(args) -> Tuple[subprocess.Popen, str]:
+    port = _free_port()
+    cmd = [sys.executable, "-m", "loadtest.fakes", "--port", str(port)]
+    for name in ("ollama", "gemini", "search", "article"):
+        for knob in ("latency", "jitter", "error_rate"):
+            value = getattr(args, f"{name}_{knob}")
+            if value is not None:
+                cmd += [f"--{name}-{knob.replace('_', '-')}", str(value)]
+    proc = subprocess.Popen(cmd, cwd=BACKEND_DIR)
+    base_url = f"http://127.0.0.1:{port}"
+    _wait_until_up(f"{base_url}/_stats")
+    return proc, base_url
+
+
+def start_api(fakes_url: str, args) -> Tuple[subprocess.Popen, str]:
+    port = _free_port()
+    env = dict(os.environ)
+    env.update({
+        "OLLAMA_URL": f"{fakes_url}/api/generate",
+        "GEMINI_API_URL": fakes_url,
+        "SEARCH_URL": f"{fakes_url}/html/",
+        "CACHE_DIR": args.cache_dir,
+    })
+    cmd = [
+        sys.executable, "-m", "uvicorn", "main:app",
+        "--host", "127.0.0.1", "--port", str(port),
+        "--workers", str(args.api_workers), "--log-level", "warning"
+    ]
+    proc = subprocess.Popen(cmd, cwd=BACKEND_DIR, env=env)
+    base_url = f"http://127.0.0.1:{port}"
+    _wait_until_up(f"{base_url}/", timeout=60.0)
+    return proc, base_url
+
+
+# --- Load generation ----------------------------------------------------------
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[index]
+
+
+async def run_scenario(
+    name: str,
+    request: Callable[[httpx.AsyncClient], Any],
+    base_url: str,
+    rps: float,
+    duration: float,
+    timeout: float
+) -> Dict[str, Any]:
+    """Fire requests at a fixed rate for `duration` seconds and summarise latencies"""
+    latencies: List[float] = []
+    errors: Dict[str, int] = {}
+    interval = 1.0 / rps
+
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=200)
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+
+        async def one():
+            start = time.perf_counter()
+            try:
+                response = await request(client)
+                elapsed = time.perf_counter() - start
+                if response.status_code >= 400:
+                    key = str(response.status_code)
+                    errors[key] = errors.get(key, 0) + 1
+                else:
+                    latencies.append(elapsed)
+            except httpx.HTTPError as e:
+                key = type(e).__name__
+                errors[key] = errors.get(key, 0) + 1
+
+        tasks = []
+        started = time.perf_counter()
+        next_at = started
+        while next_at - started < duration:
+            tasks.append(asyncio.create_task(one()))
+            next_at += interval
+            await asyncio.sleep(max(0.0, next_at - time.perf_counter()))
+        await asyncio.gather(*tasks)
+        wall = time.perf_counter() - started
+
+    sent = len(tasks)
+    failed = sum(errors.values())
+    return {
+        'scenario': name,
+        'sent': sent,
+        'ok': len(latencies),
+        'errors': errors,
+        'error_rate': round(failed / sent, 4) if sent else 0.0,
+        'throughput_rps': round(len(latencies) / wall, 2) if wall else 0.0,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 1),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 1),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 1),
+        'max_ms': round(max(latencies) * 1000, 1) if latencies else 0.0,
+    }
+
+
+def print_report(results: List[Dict[str, Any]]):
+    header = f"{'scenario':<10} {'sent':>6} {'ok':>6} {'err%':>6} {'rps':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(
+            f"{r['scenario']:<10} {r['sent']:>6} {r['ok']:>6} {r['error_rate'] * 100:>5.1f}% "
+            f"{r['throughput_rps']:>8.1f} {r['p50_ms']:>9.1f} {r['p95_ms']:>9.1f} {r['p99_ms']:>9.1f}"
+        )
+        if r['errors']:
+            print(f"{'':<10} errors: {r['errors']}")
+
+
+def check_thresholds(results: List[Dict[str, Any]], args) -> List[str]:
+    violations = []
+    for r in results:
+        if args.max_p95_ms is not None and r['p95_ms'] > args.max_p95_ms:
+            violations.append(f"{r['scenario']}: p95 {r['p95_ms']}ms > {args.max_p95_ms}ms")
+        if args.max_p99_ms is not None and r['p99_ms'] > args.max_p99_ms:
+            violations.append(f"{r['scenario']}: p99 {r['p99_ms']}ms > {args.max_p99_ms}ms")
+        if args.max_error_rate is not None and r['error_rate'] > args.max_error_rate:
+            violations.append(f"{r['scenario']}: error rate {r['error_rate']} > {args.max_error_rate}")
+    return violations
+
+
+async def drive(base_url: str, args) -> List[Dict[str, Any]]:
+    scenarios = build_scenarios(unique_media=not args.repeat_media)
+    selected = args.scenarios.split(",") if args.scenarios else list(scenarios)
+    unknown = [s for s in selected if s not in scenarios]
+    if unknown:
+        raise SystemExit(f"Unknown scenarios: {', '.join(unknown)} (available: {', '.join(scenarios)})")
+
+    results = []
+    for name in selected:
+        print(f"Running {name} at {args.rps} rps for {args.duration}s...", flush=True)
+        results.append(await run_scenario(
+            name, scenarios[name], base_url, args.rps, args.duration, args.timeout
+        ))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MDRS end-to-end load test")
+    parser.add_argument("--rps", type=float, default=10.0, help="target requests per second per scenario")
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds per scenario")
+    parser.add_argument("--scenarios", default=None, help="comma-separated subset (default: all)")
+    parser.add_argument("--timeout", type=float, default=120.0, help="per-request timeout (s)")
+    parser.add_argument("--target", default=None, help="use a running API at this URL instead of starting one")
+    parser.add_argument("--api-workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--repeat-media", action="store_true", help="reuse identical media (exercises the result cache)")
+    parser.add_argument("--cache-dir", default=os.path.join(BACKEND_DIR, ".cache", "loadtest"))
+    parser.add_argument("--json", default=None, help="write the report to this file")
+    parser.add_argument("--max-p95-ms", type=float, default=None)
+    parser.add_argument("--max-p99-ms", type=float, default=None)
+    parser.add_argument("--max-error-rate", type=float, default=None)
+    for name in ("ollama", "gemini", "search", "article"):
+        parser.add_argument(f"--{name}-latency", type=float, default=None)
+        parser.add_argument(f"--{name}-jitter", type=float, default=None)
+        parser.add_argument(f"--{name}-error-rate", type=float, default=None)
+    args = parser.parse_args()
+
+    procs: List[subprocess.Popen] = []
+    try:
+        if args.target:
+            base_url = args.target
+        else:
+            fakes, fakes_url = start_fakes(args)
+            procs.append(fakes)
+            api, base_url = start_api(fakes_url, args)
+            procs.append(api)
+
+        results = asyncio.run(drive(base_url, args))
+    finally:
+        for proc in reversed(procs):
+            proc.terminate()
+            try:
+                proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+
+    print()
+    print_report(results)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({'rps': args.rps, 'duration': args.duration, 'results': results}, f, indent=2)
+
+    violations = check_thresholds(results, args)
+    if violations:
+        print("\nThreshold violations:")
+        for v in violations:
+            print(f"  - {v}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,35 +2,65 @@
 MDRS Backend - Multimodal Deception Risk Scorer
 FastAPI server for analyzing media and providing risk scores
 """
-from fastapi import FastAPI, File, UploadFile, Form, HTTPException
+from fastapi import FastAPI, File, UploadFile, Form, HTTPException, Request
 from pydantic import BaseModel
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from typing import Optional
+from fastapi.responses import JSONResponse, Response
+from typing import Optional, Dict, Any, List, Callable
 import uvicorn
 import os
-import tempfile
-from pathlib import Path
+import json
+import asyncio
 
 from risk_engine import RiskScoringEngine
 from detectors.image_detector import ImageDetector
 from detectors.video_detector import VideoDetector
 from detectors.audio_detector import AudioDetector
 from detectors.text_detector import TextDetector
-
-from agents.orchestrator import fact_check_pipeline
+from detectors.executor import detector_executor, ClientDisconnected
+from upload_ingest import ingest_upload, UploadSizeMiddleware
+from result_cache import media_result_cache, build_media_cache_key
+from gemini_client import gemini_client, prompt_cache
+from jobs import job_manager, QueueFull
+from metrics import MetricsMiddleware, track_stage, register_queue, render_metrics
+from admission import AdmissionMiddleware
+
+from agents.orchestrator import fact_check_pipeline, fact_check_events
 from schemas.request import FactCheckRequest
 
 from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 from tools.evidence_builder import build_evidence_pack
 from tools.evidence_pack import generate_evidence_pdf
+from tools.http_client import close_http_client
+from tools.llm_cache import llm_cache
+from tools.scraper import article_cache
+from tools.source_check import search_cache
+from tools.llm_scheduler import llm_context, LLMDeadlineExceeded, INTERACTIVE, BATCH
 from datetime import datetime
+from contextlib import asynccontextmanager
 import uuid
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Spawn detector workers before serving so the first request doesn't pay for it
+    await asyncio.to_thread(detector_executor.start)
+    await job_manager.start()
+    gemini_client.start_health_probe()
+    yield
+    await gemini_client.stop_health_probe()
+    await job_manager.stop()
+    detector_executor.shutdown()
+    await gemini_client.close()
+    await close_http_client()
+
+
 app = FastAPI(
     title="MDRS API",
     description="Multimodal Deception Risk Scorer - Explainable Risk Assessment for Media",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS configuration
@@ -40,6 +70,11 @@ ALLOWED_ORIGINS = os.getenv(
     "http://localhost:3000,http://127.0.0.1:3000,https://abc.pages.dev"
 ).split(",")
 
+# Middleware added first runs innermost: CORS -> metrics -> upload size -> admission -> routes
+app.add_middleware(AdmissionMiddleware)
+app.add_middleware(UploadSizeMiddleware)
+app.add_middleware(MetricsMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:3001"],
@@ -71,6 +106,15 @@ audio_detector = AudioDetector()
 text_detector = TextDetector()
 risk_engine = RiskScoringEngine()
 
+# Queue depths sampled at scrape time
+register_queue('jobs_queued', job_manager.queue_depth)
+register_queue('jobs_running', lambda: job_manager.running)
+register_queue('detector_in_flight', lambda: detector_executor.in_flight)
+
+# Batch analysis limits
+BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "50"))
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "4"))
+
 FAKE_KEYWORDS = [
     "shocking",
     "unbelievable",
@@ -88,6 +132,127 @@ class PageData(BaseModel):
     text: str = ""
 
 
+MEDIA_DETECTORS = {
+    'image': image_detector,
+    'video': video_detector,
+    'audio': audio_detector
+}
+
+
+async def analyze_media_file(
+    modality: str,
+    path: str,
+    sha256: str,
+    metadata: Dict[str, Any],
+    request: Optional[Request] = None,
+    progress: Optional[Callable[..., None]] = None,
+    defer_gemini: bool = False
+) -> Dict[str, Any]:
+    """
+    Run detection and risk scoring for an ingested media file.
+    
+    Results are cached by content hash, file extension, source/context and detector/weights
+    version, so repeat submissions of the same media skip detection and Gemini.
+    Detection runs in the detector process pool and is abandoned if the
+    client behind `request` disconnects. `progress` is called after each stage.
+    
+    With `defer_gemini` the heuristic score is returned without waiting for
+    Gemini; the enrichment runs as a background job referenced by the
+    `gemini_pending` field, which is null when nothing was deferred (cache
+    hit, no signals, Gemini unavailable or the job queue full).
+    """
+    detector = MEDIA_DETECTORS[modality]
+    cache_key = build_media_cache_key(
+        modality, sha256, detector.VERSION, metadata,
+        extension=os.path.splitext(path)[1]
+    )
+    
+    cached = media_result_cache.get(cache_key)
+    if cached is not None:
+        result = dict(cached)
+        if result.get('signals_detected'):
+            result['timestamp'] = metadata.get('timestamp')
+        if defer_gemini:
+            # Nothing to wait for: the cached result is already final
+            result['gemini_pending'] = None
+        if progress:
+            progress('cache_hit')
+        return result
+    
+    signals = await detector_executor.detect(
+        modality, path, metadata,
+        is_disconnected=request.is_disconnected if request else None
+    )
+    if progress:
+        progress('detect', signals=len(signals))
+    
+    with track_stage('calculate_risk'):
+        if defer_gemini:
+            result = risk_engine.score_signals(modality, signals, metadata)
+        else:
+            result = await risk_engine.calculate_risk(
+                modality=modality,
+                signals=signals,
+                metadata=metadata
+            )
+    if progress:
+        progress('calculate_risk', risk_score=result['risk_score'])
+    
+    pending = None
+    if defer_gemini and signals and gemini_client.is_available():
+        pending = defer_gemini_enrichment(modality, signals, metadata, result, cache_key)
+    
+    # Don't pin a degraded result while Gemini is configured but failing
+    if result.get('gemini_verified') or not result.get('signals_detected') or not gemini_client.base_url:
+        # A copy: the memory tier keeps the object, and the response gains per-request fields
+        media_result_cache.set(cache_key, dict(result))
+    
+    if defer_gemini:
+        result['gemini_pending'] = pending
+    return result
+
+
+def client_key(request: Request) -> str:
+    """Identity used for per-client fairness (X-Client-Id header, else client address)"""
+    return request.headers.get('x-client-id') or (request.client.host if request.client else 'anonymous')
+
+
+def defer_gemini_enrichment(
+    modality: str,
+    signals: List[Dict[str, Any]],
+    metadata: Dict[str, Any],
+    result: Dict[str, Any],
+    cache_key: str
+) -> Optional[Dict[str, Any]]:
+    """
+    Queue the Gemini enrichment of a heuristic result as a background job.
+    
+    The job's result is the enriched assessment (recomputed score and Gemini
+    risk factors), which is also written to the media result cache.
+    
+    Returns:
+        Handle with the job id and its status/events URLs, or None if the job queue is full
+    """
+    heuristic = dict(result)
+    
+    async def runner(job):
+        with track_stage('gemini_enrichment'):
+            enriched = await risk_engine.enrich_with_gemini(heuristic, modality, signals, metadata)
+        if enriched.get('gemini_verified'):
+            media_result_cache.set(cache_key, dict(enriched))
+        return enriched
+    
+    try:
+        job = job_manager.submit('gemini_enrichment', runner)
+    except QueueFull:
+        return None
+    
+    return {
+        "job_id": job.id,
+        "status_url": f"/jobs/{job.id}",
+        "events_url": f"/jobs/{job.id}/events"
+    }
+
 
 @app.get("/")
 async def root():
@@ -100,42 +265,59 @@ async def root():
     }
 
 
+@app.get("/cache/stats")
+async def cache_stats():
+    """Hit/miss counters for the result caches"""
+    return {
+        "media_results": media_result_cache.stats(),
+        "gemini_prompts": prompt_cache.stats(),
+        "llm_outputs": llm_cache.stats(),
+        "articles": article_cache.stats(),
+        "search_results": search_cache.stats()
+    }
+
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics (text exposition format)"""
+    content, content_type = render_metrics()
+    return Response(content=content, media_type=content_type)
+
+
 @app.post("/analyze/image")
 async def analyze_image(
+    request: Request,
     file: UploadFile = File(...),
     source: Optional[str] = Form(None),
     timestamp: Optional[str] = Form(None),
-    context: Optional[str] = Form(None)
+    context: Optional[str] = Form(None),
+    defer_gemini: bool = False
 ):
     """
     Analyze an uploaded image for deception risk signals.
     
     Returns risk score, signals, and explainable recommendations.
+    Pass `?defer_gemini=true` to get the heuristic score immediately and the
+    Gemini-enriched result later via the `gemini_pending` job.
     """
     try:
         # Validate file type
         if not file.content_type or not file.content_type.startswith('image/'):
             raise HTTPException(status_code=400, detail="Invalid file type. Expected image.")
         
-        # Save uploaded file temporarily
-        with tempfile.NamedTemporaryFile(delete=False, suffix=Path(file.filename).suffix) as tmp_file:
-            content = await file.read()
-            tmp_file.write(content)
-            tmp_path = tmp_file.name
+        # Stream uploaded file to disk in chunks
+        upload = await ingest_upload(file, 'image')
+        tmp_path = upload['path']
         
         try:
-            # Run detection
-            signals = image_detector.detect(tmp_path, {
-                'source': source,
-                'timestamp': timestamp,
-                'context': context
-            })
-            
-            # Calculate risk score (async)
-            result = await risk_engine.calculate_risk(
+            # Run detection and scoring (served from cache for known content)
+            result = await analyze_media_file(
                 modality='image',
-                signals=signals,
-                metadata={'source': source, 'timestamp': timestamp, 'context': context}
+                path=tmp_path,
+                sha256=upload['sha256'],
+                metadata={'source': source, 'timestamp': timestamp, 'context': context},
+                request=request,
+                defer_gemini=defer_gemini
             )
             
             return JSONResponse(content=result)
@@ -144,16 +326,22 @@ async def analyze_image(
             # Cleanup
             os.unlink(tmp_path)
     
+    except HTTPException:
+        raise
+    except ClientDisconnected:
+        raise HTTPException(status_code=499, detail="Client closed request")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
 
 
 @app.post("/analyze/video")
 async def analyze_video(
+    request: Request,
     file: UploadFile = File(...),
     source: Optional[str] = Form(None),
     timestamp: Optional[str] = Form(None),
-    context: Optional[str] = Form(None)
+    context: Optional[str] = Form(None),
+    defer_gemini: bool = False
 ):
     """
     Analyze an uploaded video for deception risk signals.
@@ -165,25 +353,19 @@ async def analyze_video(
         if not file.content_type or not file.content_type.startswith('video/'):
             raise HTTPException(status_code=400, detail="Invalid file type. Expected video.")
         
-        # Save uploaded file temporarily
-        with tempfile.NamedTemporaryFile(delete=False, suffix=Path(file.filename).suffix) as tmp_file:
-            content = await file.read()
-            tmp_file.write(content)
-            tmp_path = tmp_file.name
+        # Stream uploaded file to disk in chunks
+        upload = await ingest_upload(file, 'video')
+        tmp_path = upload['path']
         
         try:
-            # Run detection
-            signals = video_detector.detect(tmp_path, {
-                'source': source,
-                'timestamp': timestamp,
-                'context': context
-            })
-            
-            # Calculate risk score (async)
-            result = await risk_engine.calculate_risk(
+            # Run detection and scoring (served from cache for known content)
+            result = await analyze_media_file(
                 modality='video',
-                signals=signals,
-                metadata={'source': source, 'timestamp': timestamp, 'context': context}
+                path=tmp_path,
+                sha256=upload['sha256'],
+                metadata={'source': source, 'timestamp': timestamp, 'context': context},
+                request=request,
+                defer_gemini=defer_gemini
             )
             
             return JSONResponse(content=result)
@@ -192,16 +374,22 @@ async def analyze_video(
             # Cleanup
             os.unlink(tmp_path)
     
+    except HTTPException:
+        raise
+    except ClientDisconnected:
+        raise HTTPException(status_code=499, detail="Client closed request")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
 
 
 @app.post("/analyze/audio")
 async def analyze_audio(
+    request: Request,
     file: UploadFile = File(...),
     source: Optional[str] = Form(None),
     timestamp: Optional[str] = Form(None),
-    context: Optional[str] = Form(None)
+    context: Optional[str] = Form(None),
+    defer_gemini: bool = False
 ):
     """
     Analyze an uploaded audio file for deception risk signals.
@@ -213,25 +401,19 @@ async def analyze_audio(
         if not file.content_type or not file.content_type.startswith('audio/'):
             raise HTTPException(status_code=400, detail="Invalid file type. Expected audio.")
         
-        # Save uploaded file temporarily
-        with tempfile.NamedTemporaryFile(delete=False, suffix=Path(file.filename).suffix) as tmp_file:
-            content = await file.read()
-            tmp_file.write(content)
-            tmp_path = tmp_file.name
+        # Stream uploaded file to disk in chunks
+        upload = await ingest_upload(file, 'audio')
+        tmp_path = upload['path']
         
         try:
-            # Run detection
-            signals = audio_detector.detect(tmp_path, {
-                'source': source,
-                'timestamp': timestamp,
-                'context': context
-            })
-            
-            # Calculate risk score (async)
-            result = await risk_engine.calculate_risk(
+            # Run detection and scoring (served from cache for known content)
+            result = await analyze_media_file(
                 modality='audio',
-                signals=signals,
-                metadata={'source': source, 'timestamp': timestamp, 'context': context}
+                path=tmp_path,
+                sha256=upload['sha256'],
+                metadata={'source': source, 'timestamp': timestamp, 'context': context},
+                request=request,
+                defer_gemini=defer_gemini
             )
             
             return JSONResponse(content=result)
@@ -240,10 +422,115 @@ async def analyze_audio(
             # Cleanup
             os.unlink(tmp_path)
     
+    except HTTPException:
+        raise
+    except ClientDisconnected:
+        raise HTTPException(status_code=499, detail="Client closed request")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
 
 
+@app.post("/analyze/batch")
+async def analyze_batch(
+    files: List[UploadFile] = File(...),
+    source: Optional[str] = Form(None),
+    timestamp: Optional[str] = Form(None),
+    context: Optional[str] = Form(None)
+):
+    """
+    Analyze many media files of mixed modality in one request.
+
+    Items are analyzed concurrently (bounded by BATCH_CONCURRENCY) and each
+    result is streamed back as one NDJSON line as soon as it finishes, so
+    output order follows completion, not upload order. Every line carries
+    the item's index in the upload.
+    """
+    if len(files) > BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many files. Maximum batch size is {BATCH_MAX_ITEMS}."
+        )
+
+    metadata = {'source': source, 'timestamp': timestamp, 'context': context}
+
+    # Ingest everything up front: the uploads are closed once this handler returns
+    items = []
+    try:
+        for index, file in enumerate(files):
+            item = {'index': index, 'filename': file.filename}
+            modality = (file.content_type or '').split('/')[0]
+
+            if modality not in MEDIA_DETECTORS:
+                item.update(status='error', error="Invalid file type. Expected image, video or audio.")
+            else:
+                item['modality'] = modality
+                try:
+                    upload = await ingest_upload(file, modality)
+                    item['upload'] = upload
+                except HTTPException as e:
+                    item.update(status='error', error=e.detail)
+
+            items.append(item)
+    except BaseException:
+        _remove_files([item['upload']['path'] for item in items if 'upload' in item])
+        raise
+
+    # The stream's own cleanup never runs if the client leaves before it starts
+    paths = [item['upload']['path'] for item in items if 'upload' in item]
+    return StreamingResponse(
+        _stream_batch_results(items, metadata),
+        media_type="application/x-ndjson",
+        background=BackgroundTask(_remove_files, paths)
+    )
+
+
+def _remove_files(paths: List[str]):
+    """Unlink temp files that still exist"""
+    for path in paths:
+        if os.path.exists(path):
+            os.unlink(path)
+
+
+async def _stream_batch_results(items: List[Dict[str, Any]], metadata: Dict[str, Any]):
+    """Yield one NDJSON line per batch item in completion order"""
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def run_item(item: Dict[str, Any]) -> Dict[str, Any]:
+        upload = item.pop('upload')
+        try:
+            async with semaphore:
+                result = await analyze_media_file(
+                    modality=item['modality'],
+                    path=upload['path'],
+                    sha256=upload['sha256'],
+                    metadata=metadata
+                )
+            return {**item, 'status': 'ok', 'result': result}
+        except Exception as e:
+            return {**item, 'status': 'error', 'error': f"Analysis failed: {str(e)}"}
+        finally:
+            if os.path.exists(upload['path']):
+                os.unlink(upload['path'])
+
+    pending_paths = [item['upload']['path'] for item in items if 'upload' in item]
+    tasks = [asyncio.ensure_future(run_item(item)) for item in items if 'upload' in item]
+
+    try:
+        # Items rejected at ingest are reported immediately
+        for item in items:
+            if item.get('status') == 'error':
+                yield json.dumps(item) + "\n"
+
+        for next_done in asyncio.as_completed(tasks):
+            yield json.dumps(await next_done) + "\n"
+
+    finally:
+        # Client went away or the stream finished: stop work and remove temp files
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        _remove_files(pending_paths)
+
 
 def detect_fake_news(text, title, url):
     score = 0
@@ -283,15 +570,155 @@ def analyze_page(data: PageData):
 
 
 @app.post("/analyze/text")
-async def analyze_text(data: AnalyzeTextRequest):
-    result = fact_check_pipeline(
-        input_text=data.text,
-        url=data.source if hasattr(data, "source") else None
-    )
+async def analyze_text(request: Request, data: AnalyzeTextRequest):
+    try:
+        with llm_context(INTERACTIVE, client=client_key(request)):
+            result = await fact_check_pipeline(
+                input_text=data.text,
+                url=data.source if hasattr(data, "source") else None
+            )
+    except LLMDeadlineExceeded:
+        raise HTTPException(
+            status_code=503,
+            detail="Language model is busy. Retry later.",
+            headers={"Retry-After": "10"}
+        )
     return result
 
 
+@app.post("/analyze/text/stream")
+async def analyze_text_stream(request: Request, data: AnalyzeTextRequest):
+    """
+    Fact-check as a Server-Sent Events stream.
     
+    Emits `extract_claims` with the claims, one `claim` event per claim as its
+    verification resolves, `reason_token` events while the explanation is
+    generated, and finally `result` with the same body as /analyze/text.
+    """
+    client = client_key(request)
+    
+    async def event_stream():
+        try:
+            with llm_context(INTERACTIVE, client=client):
+                async for event in fact_check_events(
+                    input_text=data.text,
+                    url=data.source,
+                    stream_tokens=True
+                ):
+                    yield f"event: {event['stage']}\ndata: {json.dumps(event)}\n\n"
+        except Exception as e:
+            error = {'stage': 'error', 'error': str(e)}
+            yield f"event: error\ndata: {json.dumps(error)}\n\n"
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+    
+@app.post("/jobs", status_code=202)
+async def submit_job(
+    request: Request,
+    file: Optional[UploadFile] = File(None),
+    text: Optional[str] = Form(None),
+    source: Optional[str] = Form(None),
+    timestamp: Optional[str] = Form(None),
+    context: Optional[str] = Form(None)
+):
+    """
+    Submit a long-running analysis as a background job.
+    
+    Send a media `file` for image/video/audio analysis, or `text` (and/or a
+    URL in `source`) for a fact-check. Returns a job id immediately; poll
+    GET /jobs/{id} or subscribe to GET /jobs/{id}/events for progress.
+    """
+    if file is not None:
+        modality = (file.content_type or '').split('/')[0]
+        if modality not in MEDIA_DETECTORS:
+            raise HTTPException(status_code=400, detail="Invalid file type. Expected image, video or audio.")
+        
+        # The upload is closed when this handler returns, so land it on disk first
+        upload = await ingest_upload(file, modality)
+        metadata = {'source': source, 'timestamp': timestamp, 'context': context}
+        
+        async def runner(job):
+            return await analyze_media_file(
+                modality=modality,
+                path=upload['path'],
+                sha256=upload['sha256'],
+                metadata=metadata,
+                progress=job.emit
+            )
+        
+        kind = modality
+        cleanup = lambda: os.unlink(upload['path'])
+    
+    elif text or source:
+        client = client_key(request)
+        
+        async def runner(job):
+            # Background work yields the LLM to interactive requests
+            with llm_context(BATCH, client=client):
+                return await fact_check_pipeline(
+                    input_text=text,
+                    url=source,
+                    progress=job.emit
+                )
+        
+        kind = 'fact_check'
+        cleanup = None
+    
+    else:
+        raise HTTPException(status_code=400, detail="Provide a file, text or source URL.")
+    
+    try:
+        job = job_manager.submit(kind, runner, cleanup=cleanup)
+    except QueueFull:
+        if cleanup:
+            cleanup()
+        raise HTTPException(
+            status_code=503,
+            detail="Job queue is full. Retry later.",
+            headers={"Retry-After": "5"}
+        )
+    
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "status_url": f"/jobs/{job.id}",
+        "events_url": f"/jobs/{job.id}/events"
+    }
+
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Current status, completed stages and (when finished) the result of a job"""
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
+
+
+@app.get("/jobs/{job_id}/events")
+async def stream_job_events(job_id: str):
+    """Server-Sent Events stream of a job's progress, ending with its result"""
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    async def event_stream():
+        async for event in job_manager.stream_events(job):
+            yield f"event: {event['stage']}\ndata: {json.dumps(event)}\n\n"
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"}
+    )
+
+
 @app.post("/generate-evidence-pack")
 def create_evidence_pack(data: EvidenceRequest):
     
@@ -0,0 +1,183 @@
+"""
+Metrics
+Prometheus latency histograms, in-flight gauges, queue depths and cache hit ratios
+"""
+import time
+from contextlib import contextmanager
+from typing import Callable
+
+from prometheus_client import Counter, Gauge, Histogram, CONTENT_TYPE_LATEST, generate_latest
+from starlette.routing import Match
+
+
+# Buckets span fast cache hits up to slow LLM calls (seconds)
+LATENCY_BUCKETS = (
+    0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0
+)
+
+STAGE_LATENCY = Histogram(
+    'mdrs_stage_latency_seconds',
+    'Latency of individual request-path stages (detectors, scoring, upstream calls)',
+    ['stage'],
+    buckets=LATENCY_BUCKETS
+)
+
+STAGE_ERRORS = Counter(
+    'mdrs_stage_errors_total',
+    'Stages that raised an exception',
+    ['stage']
+)
+
+STAGE_IN_FLIGHT = Gauge(
+    'mdrs_stage_in_flight',
+    'Stages currently executing',
+    ['stage']
+)
+
+HTTP_LATENCY = Histogram(
+    'mdrs_http_request_duration_seconds',
+    'End-to-end HTTP request latency',
+    ['method', 'route', 'status'],
+    buckets=LATENCY_BUCKETS
+)
+
+HTTP_IN_FLIGHT = Gauge(
+    'mdrs_http_in_flight_requests',
+    'HTTP requests currently being served',
+    ['route']
+)
+
+QUEUE_DEPTH = Gauge(
+    'mdrs_queue_depth',
+    'Work items waiting or running in internal queues',
+    ['queue']
+)
+
+CACHE_LOOKUPS = Gauge(
+    'mdrs_cache_lookups',
+    'Cache lookups since process start',
+    ['cache', 'result']
+)
+
+ADMISSION_REJECTIONS = Counter(
+    'mdrs_admission_rejections_total',
+    'Requests rejected with 503 by admission control',
+    ['route', 'reason']
+)
+
+LLM_DROPPED = Counter(
+    'mdrs_llm_dropped_total',
+    'LLM calls dropped by the scheduler before running',
+    ['priority', 'reason']
+)
+
+COALESCED_CALLS = Counter(
+    'mdrs_coalesced_calls_total',
+    'Calls that joined an identical in-flight upstream call instead of making their own',
+    ['call']
+)
+
+CIRCUIT_STATE = Gauge(
+    'mdrs_circuit_breaker_state',
+    'Upstream circuit breaker state (0=closed, 1=half-open, 2=open)',
+    ['upstream']
+)
+
+UPSTREAM_HEALTHY = Gauge(
+    'mdrs_upstream_available',
+    'Whether an upstream is currently considered available (1) or not (0)',
+    ['upstream']
+)
+
+CACHE_HIT_RATIO = Gauge(
+    'mdrs_cache_hit_ratio',
+    'Fraction of cache lookups served from cache',
+    ['cache']
+)
+
+
+@contextmanager
+def track_stage(stage: str):
+    """
+    Time a block of work (sync or containing awaits) under a stage label.
+
+    Usage:
+        with track_stage('search_web'):
+            links = await search_web(query)
+    """
+    STAGE_IN_FLIGHT.labels(stage).inc()
+    start = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        STAGE_ERRORS.labels(stage).inc()
+        raise
+    finally:
+        STAGE_LATENCY.labels(stage).observe(time.perf_counter() - start)
+        STAGE_IN_FLIGHT.labels(stage).dec()
+
+
+def register_queue(name: str, depth: Callable[[], float]):
+    """Report a queue's depth, sampled at scrape time"""
+    QUEUE_DEPTH.labels(name).set_function(depth)
+
+
+def register_cache(cache):
+    """Report hit/miss counts and hit ratio of a cache exposing stats()"""
+    CACHE_LOOKUPS.labels(cache.name, 'hit').set_function(lambda: cache.hits)
+    CACHE_LOOKUPS.labels(cache.name, 'miss').set_function(lambda: cache.misses)
+    CACHE_HIT_RATIO.labels(cache.name).set_function(lambda: cache.stats()['hit_ratio'])
+
+
+def route_template(scope) -> str:
+    """Path template of the route an HTTP scope will be dispatched to"""
+    # Resolved once per request and shared by the middlewares
+    if 'mdrs.route' not in scope:
+        scope['mdrs.route'] = 'unmatched'
+        for route in scope['app'].router.routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                scope['mdrs.route'] = getattr(route, 'path', scope['path'])
+                break
+    return scope['mdrs.route']
+
+
+def render_metrics():
+    """Prometheus text exposition of every registered metric"""
+    return generate_latest(), CONTENT_TYPE_LATEST
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording in-flight count and latency per route template.
+
+    Routes are labelled by their path template (e.g. /jobs/{job_id}) so the
+    label set stays bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        route = route_template(scope)
+        status = {'code': 500}
+
+        async def send_wrapper(message):
+            if message['type'] == 'http.response.start':
+                status['code'] = message['status']
+            await send(message)
+
+        HTTP_IN_FLIGHT.labels(route).inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_LATENCY.labels(scope['method'], route, str(status['code'])).observe(
+                time.perf_counter() - start
+            )
+            HTTP_IN_FLIGHT.labels(route).dec()
@@ -0,0 +1,62 @@
+"""
+Media Result Cache
+Content-addressed cache of risk assessments, keyed by file hash, context and detector version
+"""
+import os
+import json
+import hashlib
+from typing import Dict, Any, Optional
+
+from tools.cache import TieredCache
+from risk_engine import RiskScoringEngine
+
+
+# Fingerprint of the scoring weights/thresholds; changing them invalidates cached scores
+WEIGHTS_VERSION = hashlib.sha256(
+    json.dumps(
+        {'weights': RiskScoringEngine.WEIGHTS, 'thresholds': RiskScoringEngine.THRESHOLDS},
+        sort_keys=True
+    ).encode('utf-8')
+).hexdigest()[:12]
+
+
+def build_media_cache_key(
+    modality: str,
+    sha256: str,
+    detector_version: str,
+    metadata: Optional[Dict[str, Any]] = None,
+    extension: str = ''
+) -> str:
+    """
+    Build the cache key for a media analysis.
+
+    Only inputs that influence the result are part of the key: source and
+    context, plus the file extension, which the audio/video detectors score.
+    The timestamp is echoed back per request instead.
+
+    Args:
+        modality: Type of media (image, video, audio)
+        sha256: Hex digest of the uploaded content
+        detector_version: VERSION of the detector that produced the signals
+        metadata: Request context (source, timestamp, context)
+        extension: Suffix of the uploaded file name (e.g. '.mp3')
+
+    Returns:
+        Opaque cache key string
+    """
+    metadata = metadata or {}
+    context = json.dumps(
+        [metadata.get('source') or '', metadata.get('context') or '', extension.lower()],
+        ensure_ascii=False
+    )
+    context_hash = hashlib.sha256(context.encode('utf-8')).hexdigest()[:16]
+    return f"{modality}:{detector_version}:{WEIGHTS_VERSION}:{sha256}:{context_hash}"
+
+
+# Global instance
+media_result_cache = TieredCache(
+    name="media_results",
+    ttl=float(os.getenv("MEDIA_CACHE_TTL_SECONDS", str(7 * 86400))),
+    max_memory_items=int(os.getenv("MEDIA_CACHE_MEMORY_ITEMS", "1024")),
+    max_disk_bytes=int(os.getenv("MEDIA_CACHE_MAX_MB", "256")) * 1024 * 1024
+)
@@ -69,32 +69,27 @@ class RiskScoringEngine:
         Returns:
             Risk assessment with score, level, explanation, and recommendations
         """
+        result = self.score_signals(modality, signals, metadata)
         if not signals:
-            return self._generate_low_risk_response(modality)
+            return result
+        return await self.enrich_with_gemini(result, modality, signals, metadata)
+    
+    def score_signals(self, modality: str, signals: List[Dict[str, Any]], metadata: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        Deterministic weighted score, without the Gemini enrichment.
         
-        # Get weights for this modality
-        weights = self.WEIGHTS.get(modality, {})
+        Args:
+            modality: Type of media (image, video, audio, text)
+            signals: List of detected signals with confidence scores
+            metadata: Optional context (source, timestamp, etc.)
         
-        # Calculate weighted risk score
-        total_score = 0.0
-        signal_contributions = []
+        Returns:
+            Risk assessment with gemini_verified=False
+        """
+        if not signals:
+            return self._generate_low_risk_response(modality)
         
-        for signal in signals:
-            signal_type = signal['type']
-            confidence = signal['confidence']
-            weight = weights.get(signal_type, 0.1)  # Default weight if not defined
-            
-            contribution = confidence * weight * 100
-            total_score += contribution
-            
-            signal_contributions.append({
-                'signal': signal_type,
-                'description': signal['description'],
-                'confidence': round(confidence, 2),
-                'weight': weight,
-                'contribution': round(contribution, 2),
-                'evidence': signal.get('evidence', {})
-            })
+        total_score, signal_contributions = self._weigh_signals(modality, signals)
         
         # Cap at 100
         risk_score = min(100, round(total_score))
@@ -108,58 +103,116 @@ class RiskScoringEngine:
         # Generate recommendation
         recommendation = self._generate_recommendation(risk_level, modality)
         
-        # Try to get Gemini analysis
-        gemini_analysis = None
-        gemini_signals = []
-        
-        if gemini_client.is_available():
-            try:
-                gemini_analysis = await gemini_client.analyze_media_risk(
-                    modality, signals, metadata or {}
-                )
-                
-                if gemini_analysis:
-                    # Extract additional risk factors from Gemini
-                    additional_factors = gemini_analysis.get('additional_context', [])
-                    for i, factor in enumerate(additional_factors[:3]):  # Max 3 additional
-                        gemini_signals.append({
-                            'signal': 'ai_verified_risk_factor',
-                            'description': factor,
-                            'confidence': 0.70,  # Moderate confidence for AI insights
-                            'weight': 0.15,
-                            'contribution': 10.5,  # ~10 points each
-                            'evidence': {'source': 'Gemini AI', 'factor_id': i+1}
-                        })
-                    
-                    # Add Gemini signals to total if they add value
-                    if gemini_signals:
-                        for gs in gemini_signals:
-                            total_score += gs['contribution']
-                        signal_contributions.extend(gemini_signals)
-                        
-                        # Recalculate risk score with Gemini input
-                        risk_score = min(100, round(total_score))
-                        risk_level = self._determine_risk_level(risk_score)
-            except Exception as e:
-                print(f"Gemini analysis error: {e}")
-        
         # Compile result
-        result = {
+        return {
             'risk_score': risk_score,
             'risk_level': risk_level,
             'modality': modality,
-            'signals_detected': len(signals) + len(gemini_signals),
+            'signals_detected': len(signals),
             'signal_breakdown': signal_contributions,
             'explanation': explanation,
             'recommendation': recommendation,
-            'gemini_analysis': gemini_analysis.get('gemini_analysis') if gemini_analysis else None,
-            'gemini_verified': gemini_analysis is not None,
+            'gemini_analysis': None,
+            'gemini_verified': False,
             'disclaimer': 'This is a probabilistic risk assessment. Human verification is essential for decision-making.',
             'timestamp': metadata.get('timestamp') if metadata else None,
             'source': metadata.get('source') if metadata else None
         }
+    
+    async def enrich_with_gemini(
+        self,
+        result: Dict[str, Any],
+        modality: str,
+        signals: List[Dict[str, Any]],
+        metadata: Dict[str, Any] = None
+    ) -> Dict[str, Any]:
+        """
+        Add Gemini risk factors to a score_signals() result and recompute the score.
+        
+        Args:
+            result: Heuristic assessment from score_signals()
+            modality: Type of media (image, video, audio, text)
+            signals: The signals the assessment was computed from
+            metadata: Optional context (source, timestamp, etc.)
+        
+        Returns:
+            New assessment; the heuristic one is returned unchanged if Gemini is unavailable
+        """
+        # Try to get Gemini analysis
+        gemini_analysis = None
+        gemini_signals = []
+        
+        if not gemini_client.is_available():
+            return result
+        
+        try:
+            gemini_analysis = await gemini_client.analyze_media_risk(
+                modality, signals, metadata or {}
+            )
+            
+            if gemini_analysis:
+                # Extract additional risk factors from Gemini
+                additional_factors = gemini_analysis.get('additional_context', [])
+                for i, factor in enumerate(additional_factors[:3]):  # Max 3 additional
+                    gemini_signals.append({
+                        'signal': 'ai_verified_risk_factor',
+                        'description': factor,
+                        'confidence': 0.70,  # Moderate confidence for AI insights
+                        'weight': 0.15,
+                        'contribution': 10.5,  # ~10 points each
+                        'evidence': {'source': 'Gemini AI', 'factor_id': i+1}
+                    })
+        except Exception as e:
+            print(f"Gemini analysis error: {e}")
+        
+        if gemini_analysis is None:
+            return result
+        
+        enriched = dict(result)
+        enriched['gemini_analysis'] = gemini_analysis.get('gemini_analysis')
+        enriched['gemini_verified'] = True
+        
+        # Add Gemini signals to total if they add value
+        if gemini_signals:
+            total_score, _ = self._weigh_signals(modality, signals)
+            for gs in gemini_signals:
+                total_score += gs['contribution']
+            
+            # Recalculate risk score with Gemini input
+            enriched['risk_score'] = min(100, round(total_score))
+            enriched['risk_level'] = self._determine_risk_level(enriched['risk_score'])
+            enriched['signal_breakdown'] = result['signal_breakdown'] + gemini_signals
+            enriched['signals_detected'] = len(signals) + len(gemini_signals)
+        
+        return enriched
+    
+    def _weigh_signals(self, modality: str, signals: List[Dict[str, Any]]):
+        """Weighted total and per-signal contributions"""
+        # Get weights for this modality
+        weights = self.WEIGHTS.get(modality, {})
+        
+        # Calculate weighted risk score
+        total_score = 0.0
+        signal_contributions = []
+        
+        for signal in signals:
+            signal_type = signal['type']
+            confidence = signal['confidence']
+            weight = weights.get(signal_type, 0.1)  # Default weight if not defined
+            
+            contribution = confidence * weight * 100
+            total_score += contribution
+            
+            signal_contributions.append({
+                'signal': signal_type,
+                'description': signal['description'],
+                'confidence': round(confidence, 2),
+                'weight': weight,
+                'contribution': round(contribution, 2),
+                'evidence': signal.get('evidence', {})
+            })
         
-        return result
+        return total_score, signal_contributions
     
     def _determine_risk_level(self, score: int) -> str:
         """Categorize risk score into Low/Medium/High"""
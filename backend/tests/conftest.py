@@ -0,0 +1,12 @@
+"""
+Shared test setup: backend modules are imported as top-level packages, the way uvicorn runs them
+"""
+import os
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+# Module-level caches open their SQLite stores at import; keep them out of backend/.cache
+os.environ.setdefault("CACHE_DIR", tempfile.mkdtemp(prefix="mdrs-test-cache-"))
@@ -0,0 +1,135 @@
+"""
+Admission control: bounded concurrency and wait queue, 503 with Retry-After when shed
+"""
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+
+from admission import AdmissionLimiter, AdmissionMiddleware, Overloaded
+
+
+def test_limiter_queues_then_hands_over_slots_in_order():
+    async def scenario():
+        limiter = AdmissionLimiter("test", concurrency=1, queue=2, timeout=1.0)
+        await limiter.acquire()
+
+        order = []
+
+        async def waiter(name):
+            await limiter.acquire()
+            order.append(name)
+
+        tasks = [asyncio.create_task(waiter(n)) for n in ("first", "second")]
+        await asyncio.sleep(0)
+        assert limiter.waiting == 2
+
+        limiter.release()
+        await asyncio.sleep(0)
+        limiter.release()
+        await asyncio.gather(*tasks)
+
+        assert order == ["first", "second"]
+        assert limiter.active == 1
+
+    asyncio.run(scenario())
+
+
+def test_limiter_rejects_when_queue_is_full():
+    async def scenario():
+        limiter = AdmissionLimiter("test", concurrency=1, queue=1, timeout=1.0)
+        await limiter.acquire()
+        queued = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+
+        with pytest.raises(Overloaded) as excinfo:
+            await limiter.acquire()
+        assert excinfo.value.reason == "queue_full"
+        assert excinfo.value.retry_after >= 1
+
+        queued.cancel()
+        await asyncio.gather(queued, return_exceptions=True)
+
+    asyncio.run(scenario())
+
+
+def test_limiter_rejects_waiters_past_their_timeout():
+    async def scenario():
+        limiter = AdmissionLimiter("test", concurrency=1, queue=4, timeout=0.01)
+        await limiter.acquire()
+
+        with pytest.raises(Overloaded) as excinfo:
+            await limiter.acquire()
+        assert excinfo.value.reason == "queue_timeout"
+        assert limiter.waiting == 0
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_waiter_does_not_leak_its_slot():
+    async def scenario():
+        limiter = AdmissionLimiter("test", concurrency=1, queue=4, timeout=1.0)
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+
+        # Slot handed over and the waiter cancelled in the same tick
+        limiter.release()
+        waiter.cancel()
+        outcome, = await asyncio.gather(waiter, return_exceptions=True)
+        if not isinstance(outcome, asyncio.CancelledError):
+            # Some Python versions let the acquire win the race; then the caller owns the slot
+            limiter.release()
+
+        assert limiter.active == 0
+
+    asyncio.run(scenario())
+
+
+def test_middleware_answers_503_with_retry_after_when_shedding():
+    app = FastAPI()
+    gate = asyncio.Event()
+
+    @app.post("/slow")
+    async def slow():
+        await gate.wait()
+        return {"ok": True}
+
+    middleware = AdmissionMiddleware(
+        app,
+        route_costs={("POST", "/slow"): "tiny"},
+        cost_classes={"tiny": {"concurrency": 1, "queue": 0, "timeout": 1.0}}
+    )
+
+    async def call():
+        messages = []
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            messages.append(message)
+
+        scope = {
+            "type": "http", "method": "POST", "path": "/slow", "raw_path": b"/slow",
+            "query_string": b"", "headers": [], "app": app, "root_path": "",
+            "scheme": "http", "server": ("test", 80), "client": ("127.0.0.1", 1),
+            "http_version": "1.1", "asgi": {"version": "3.0"}
+        }
+        await middleware(scope, receive, send)
+        start = next(m for m in messages if m["type"] == "http.response.start")
+        return start["status"], dict(start["headers"])
+
+    async def scenario():
+        first = asyncio.create_task(call())
+        await asyncio.sleep(0.01)
+
+        status, headers = await call()
+        assert status == 503
+        assert int(headers[b"retry-after"]) >= 1
+
+        gate.set()
+        status, _ = await first
+        assert status == 200
+
+    asyncio.run(scenario())
@@ -0,0 +1,174 @@
+"""
+LLMScheduler: priority classes, per-client round-robin and deadlines; coalescing per class
+"""
+import asyncio
+import time
+
+import pytest
+
+from tools import ollama_client
+from tools.llm_scheduler import (
+    LLMScheduler, LLMDeadlineExceeded, llm_context, current_priority, INTERACTIVE, BATCH
+)
+
+
+async def _queue(scheduler, order, name, priority, client="c", deadline=None):
+    await scheduler.acquire(priority, client, deadline)
+    order.append(name)
+
+
+async def _settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_free_slots_are_taken_without_queueing():
+    async def scenario():
+        scheduler = LLMScheduler("test", concurrency=2)
+        await scheduler.acquire(BATCH, "a", None)
+        await scheduler.acquire(INTERACTIVE, "b", None)
+        assert scheduler.active == 2
+        assert scheduler.waiting() == 0
+
+    asyncio.run(scenario())
+
+
+def test_interactive_waiters_go_before_batch_waiters():
+    async def scenario():
+        scheduler = LLMScheduler("test", concurrency=1)
+        await scheduler.acquire(BATCH, "job", None)
+
+        order = []
+        tasks = [
+            asyncio.create_task(_queue(scheduler, order, "batch", BATCH, "job")),
+            asyncio.create_task(_queue(scheduler, order, "interactive", INTERACTIVE, "user")),
+        ]
+        await _settle()
+        assert scheduler.stats()["waiting_batch"] == 1
+        assert scheduler.stats()["waiting_interactive"] == 1
+
+        for _ in range(2):
+            scheduler.release()
+            await _settle()
+        await asyncio.gather(*tasks)
+
+        assert order == ["interactive", "batch"]
+
+    asyncio.run(scenario())
+
+
+def test_clients_in_one_class_take_turns():
+    async def scenario():
+        scheduler = LLMScheduler("test", concurrency=1)
+        await scheduler.acquire(INTERACTIVE, "x", None)
+
+        order = []
+        tasks = [asyncio.create_task(_queue(scheduler, order, f"bulk{i}", INTERACTIVE, "bulk")) for i in range(3)]
+        await _settle()
+        tasks.append(asyncio.create_task(_queue(scheduler, order, "other", INTERACTIVE, "other")))
+        await _settle()
+
+        for _ in range(4):
+            scheduler.release()
+            await _settle()
+        await asyncio.gather(*tasks)
+
+        # The late single request doesn't wait behind the bulk client's whole backlog
+        assert order == ["bulk0", "other", "bulk1", "bulk2"]
+
+    asyncio.run(scenario())
+
+
+def test_waiter_is_dropped_when_its_deadline_passes():
+    async def scenario():
+        scheduler = LLMScheduler("test", concurrency=1)
+        await scheduler.acquire(BATCH, "job", None)
+
+        with pytest.raises(LLMDeadlineExceeded):
+            await scheduler.acquire(INTERACTIVE, "user", time.monotonic() + 0.01)
+        assert scheduler.waiting() == 0
+
+        # The slot holder releasing afterwards returns the slot to the pool
+        scheduler.release()
+        assert scheduler.active == 0
+
+    asyncio.run(scenario())
+
+
+def test_expired_tickets_are_skipped_at_handover():
+    async def scenario():
+        scheduler = LLMScheduler("test", concurrency=1)
+        await scheduler.acquire(BATCH, "job", None)
+
+        order = []
+        # Deadline long enough to stay queued, then forced into the past
+        expired = asyncio.create_task(_queue(scheduler, order, "expired", INTERACTIVE, "a", time.monotonic() + 60))
+        alive = asyncio.create_task(_queue(scheduler, order, "alive", INTERACTIVE, "b"))
+        await _settle()
+        scheduler._queues[INTERACTIVE]["a"][0].deadline = time.monotonic() - 1
+
+        scheduler.release()
+        await _settle()
+
+        with pytest.raises(LLMDeadlineExceeded):
+            await expired
+        await alive
+        assert order == ["alive"]
+        assert scheduler.active == 1
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_waiter_leaves_the_queue():
+    async def scenario():
+        scheduler = LLMScheduler("test", concurrency=1)
+        await scheduler.acquire(BATCH, "job", None)
+        waiter = asyncio.create_task(scheduler.acquire(INTERACTIVE, "user", None))
+        await _settle()
+
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        assert scheduler.waiting() == 0
+
+        scheduler.release()
+        assert scheduler.active == 0
+
+    asyncio.run(scenario())
+
+
+def test_llm_context_sets_and_restores_the_priority():
+    assert current_priority() == INTERACTIVE
+    with llm_context(BATCH, client="job"):
+        assert current_priority() == BATCH
+    assert current_priority() == INTERACTIVE
+
+
+def test_identical_prompts_coalesce_only_within_a_priority_class(monkeypatch):
+    async def scenario():
+        started = []
+        release = asyncio.Event()
+
+        async def fake_generate(prompt, options):
+            # Runs in the shared call's context, i.e. its first caller's
+            started.append(current_priority())
+            await release.wait()
+            return "answer"
+
+        monkeypatch.setattr(ollama_client, "_generate", fake_generate)
+
+        async def call(priority):
+            with llm_context(priority, client=priority):
+                return await ollama_client.run_ollama("same prompt")
+
+        calls = [
+            asyncio.create_task(call(BATCH)),
+            asyncio.create_task(call(INTERACTIVE)),
+            asyncio.create_task(call(INTERACTIVE)),
+        ]
+        await _settle()
+        release.set()
+
+        assert await asyncio.gather(*calls) == ["answer"] * 3
+        assert sorted(started) == sorted([BATCH, INTERACTIVE])
+
+    asyncio.run(scenario())
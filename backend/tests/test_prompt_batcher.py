@@ -0,0 +1,97 @@
+"""
+PromptBatcher: concurrent prompts share one batch request; fallback when batching is unsupported
+"""
+import asyncio
+
+import pytest
+
+from gemini_client import PromptBatcher, BatchUnsupported
+
+
+class FakeUpstream:
+    def __init__(self, batch_supported=True):
+        self.batch_supported = batch_supported
+        self.batches = []
+        self.singles = []
+
+    async def send_batch(self, prompts):
+        if not self.batch_supported:
+            raise BatchUnsupported()
+        self.batches.append(list(prompts))
+        return [f"re:{p}" for p in prompts]
+
+    async def send_one(self, prompt):
+        self.singles.append(prompt)
+        if prompt == "boom":
+            raise RuntimeError("upstream failed")
+        return f"re:{prompt}"
+
+
+def test_concurrent_prompts_go_out_as_one_batch():
+    async def scenario():
+        upstream = FakeUpstream()
+        batcher = PromptBatcher(upstream.send_batch, upstream.send_one, window=0.01, max_size=16)
+        results = await asyncio.gather(*(batcher.submit(f"p{i}") for i in range(5)))
+
+        assert results == [f"re:p{i}" for i in range(5)]
+        assert upstream.batches == [[f"p{i}" for i in range(5)]]
+        assert upstream.singles == []
+
+    asyncio.run(scenario())
+
+
+def test_full_batch_is_sent_without_waiting_for_the_window():
+    async def scenario():
+        upstream = FakeUpstream()
+        batcher = PromptBatcher(upstream.send_batch, upstream.send_one, window=60, max_size=3)
+        results = await asyncio.wait_for(
+            asyncio.gather(*(batcher.submit(f"p{i}") for i in range(3))), timeout=1
+        )
+        assert results == ["re:p0", "re:p1", "re:p2"]
+
+    asyncio.run(scenario())
+
+
+def test_lone_prompt_uses_the_single_endpoint():
+    async def scenario():
+        upstream = FakeUpstream()
+        batcher = PromptBatcher(upstream.send_batch, upstream.send_one, window=0.001)
+        assert await batcher.submit("only") == "re:only"
+        assert upstream.batches == []
+        assert upstream.singles == ["only"]
+
+    asyncio.run(scenario())
+
+
+def test_unsupported_batching_falls_back_per_item_and_stays_off():
+    async def scenario():
+        upstream = FakeUpstream(batch_supported=False)
+        batcher = PromptBatcher(upstream.send_batch, upstream.send_one, window=0.01)
+        results = await asyncio.gather(
+            batcher.submit("a"), batcher.submit("boom"), batcher.submit("c"),
+            return_exceptions=True
+        )
+
+        assert results[0] == "re:a" and results[2] == "re:c"
+        # One item failing doesn't fail its batch mates
+        assert isinstance(results[1], RuntimeError)
+        assert not batcher.supported
+        assert not batcher.enabled
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_caller_does_not_cancel_the_batch():
+    async def scenario():
+        upstream = FakeUpstream()
+        batcher = PromptBatcher(upstream.send_batch, upstream.send_one, window=0.01)
+        leaving = asyncio.create_task(batcher.submit("leaving"))
+        staying = asyncio.create_task(batcher.submit("staying"))
+        await asyncio.sleep(0)
+        leaving.cancel()
+
+        assert await staying == "re:staying"
+        with pytest.raises(asyncio.CancelledError):
+            await leaving
+
+    asyncio.run(scenario())
@@ -0,0 +1,116 @@
+"""
+SingleFlight: identical in-flight calls share one execution
+"""
+import asyncio
+
+import pytest
+
+from tools.singleflight import SingleFlight
+
+
+def test_concurrent_identical_calls_run_once():
+    async def scenario():
+        flight = SingleFlight("test")
+        calls = []
+
+        async def work():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "result"
+
+        results = await asyncio.gather(*(flight.do("k", work) for _ in range(5)))
+
+        assert results == ["result"] * 5
+        assert len(calls) == 1
+        assert flight.in_flight() == 0
+
+    asyncio.run(scenario())
+
+
+def test_different_keys_do_not_coalesce():
+    async def scenario():
+        flight = SingleFlight("test")
+        calls = []
+
+        async def work(value):
+            calls.append(value)
+            await asyncio.sleep(0)
+            return value
+
+        assert await asyncio.gather(flight.do("a", lambda: work("a")), flight.do("b", lambda: work("b"))) == ["a", "b"]
+        assert sorted(calls) == ["a", "b"]
+
+    asyncio.run(scenario())
+
+
+def test_nothing_is_remembered_after_completion():
+    async def scenario():
+        flight = SingleFlight("test")
+        calls = []
+
+        async def work():
+            calls.append(1)
+            return len(calls)
+
+        assert await flight.do("k", work) == 1
+        assert await flight.do("k", work) == 2
+
+    asyncio.run(scenario())
+
+
+def test_failure_is_shared_by_every_waiter():
+    async def scenario():
+        flight = SingleFlight("test")
+
+        async def work():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("upstream down")
+
+        results = await asyncio.gather(*(flight.do("k", work) for _ in range(3)), return_exceptions=True)
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+    asyncio.run(scenario())
+
+
+def test_one_caller_leaving_does_not_cancel_the_shared_call():
+    async def scenario():
+        flight = SingleFlight("test")
+
+        async def work():
+            await asyncio.sleep(0.02)
+            return "done"
+
+        leaving = asyncio.create_task(flight.do("k", work))
+        staying = asyncio.create_task(flight.do("k", work))
+        await asyncio.sleep(0)
+        leaving.cancel()
+
+        assert await staying == "done"
+        with pytest.raises(asyncio.CancelledError):
+            await leaving
+
+    asyncio.run(scenario())
+
+
+def test_shared_call_is_cancelled_when_every_caller_leaves():
+    async def scenario():
+        flight = SingleFlight("test")
+        cancelled = asyncio.Event()
+
+        async def work():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        callers = [asyncio.create_task(flight.do("k", work)) for _ in range(2)]
+        await asyncio.sleep(0)
+        for caller in callers:
+            caller.cancel()
+        await asyncio.gather(*callers, return_exceptions=True)
+
+        await asyncio.wait_for(cancelled.wait(), timeout=1)
+        assert flight.in_flight() == 0
+
+    asyncio.run(scenario())
@@ -0,0 +1,68 @@
+"""
+TieredCache: memory LRU in front of the SQLite store
+"""
+import time
+
+import pytest
+
+from tools import cache as cache_module
+from tools.cache import TieredCache
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache_module, "CACHE_DIR", str(tmp_path))
+    return tmp_path
+
+
+def test_memory_lru_evicts_least_recently_used(cache_dir):
+    cache = TieredCache("lru", max_memory_items=2, persistent=False)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_disk_hit_is_promoted_to_memory(cache_dir):
+    cache = TieredCache("promote", max_memory_items=1)
+    cache.set("a", {"score": 1})
+    cache.set("b", {"score": 2})  # pushes "a" out of the memory tier
+
+    assert cache.get("a") == {"score": 1}
+    assert (cache.disk_hits, cache.memory_hits) == (1, 0)
+
+    assert cache.get("a") == {"score": 1}
+    assert (cache.disk_hits, cache.memory_hits) == (1, 1)
+
+
+def test_entries_survive_a_new_instance(cache_dir):
+    TieredCache("restart", compress=True).set("k", [1, 2, 3])
+
+    reopened = TieredCache("restart", compress=True)
+    assert reopened.get("k") == [1, 2, 3]
+    assert reopened.disk_hits == 1
+
+
+def test_expired_entries_miss_in_both_tiers(cache_dir, monkeypatch):
+    cache = TieredCache("ttl", ttl=10)
+    cache.set("k", "v")
+
+    later = time.time() + 11
+    monkeypatch.setattr(cache_module.time, "time", lambda: later)
+    assert cache.get("k") is None
+    assert cache.misses == 1
+
+
+def test_disk_store_is_trimmed_to_its_size_cap(cache_dir):
+    cache = TieredCache("trim", max_memory_items=1, max_disk_bytes=1000)
+    for i in range(20):
+        cache.set(f"k{i}", "x" * 100)
+
+    assert cache.stats()["disk_bytes"] <= 1000
+    assert cache.evictions > 0
+    assert cache.get("k19") == "x" * 100
+    assert cache.get("k0") is None
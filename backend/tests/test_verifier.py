@@ -0,0 +1,160 @@
+"""
+Claim verification: per-claim early exit, shared downloads and incremental results
+"""
+import asyncio
+import time
+
+import pytest
+
+from agents import orchestrator, verifier
+
+SUPPORT = {
+    "moon": "Astronauts landed on the moon in 1969 during the Apollo mission.",
+    "budget": "The city council approved the new school budget on Tuesday.",
+}
+CLAIMS = [
+    {"claim": "Astronauts landed on the moon in 1969", "type": "event"},
+    {"claim": "The city council approved the new school budget", "type": "event"},
+]
+
+
+class FakeWeb:
+    """search_web / scrape_url stand-ins with per-URL delays"""
+
+    def __init__(self, results, pages):
+        self.results = results      # query keyword -> URLs, or an exception
+        self.pages = pages          # url -> (delay, text)
+        self.started = []
+        self.finished = []
+        self.cancelled = []
+
+    async def search_web(self, query):
+        for keyword, urls in self.results.items():
+            if keyword in query.lower():
+                if isinstance(urls, Exception):
+                    raise urls
+                return urls
+        return []
+
+    async def scrape_url(self, url):
+        delay, text = self.pages[url]
+        self.started.append(url)
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled.append(url)
+            raise
+        self.finished.append(url)
+        return {"title": "", "text": text, "source": url}
+
+
+@pytest.fixture
+def web(monkeypatch):
+    def install(results, pages):
+        fake = FakeWeb(results, pages)
+        monkeypatch.setattr(verifier, "search_web", fake.search_web)
+        monkeypatch.setattr(verifier, "scrape_url", fake.scrape_url)
+        return fake
+    return install
+
+
+async def _collect(claims, time_budget=5):
+    start = time.monotonic()
+    events = []
+    async for index, result in verifier.iter_verified_claims(claims, "", time_budget=time_budget):
+        events.append((index, result, time.monotonic() - start))
+    return events
+
+
+def test_claims_are_reported_as_they_resolve(web):
+    web(
+        {"moon": ["http://a/moon-fast"], "budget": ["http://b/budget-slow"]},
+        {"http://a/moon-fast": (0.05, SUPPORT["moon"]), "http://b/budget-slow": (0.6, SUPPORT["budget"])},
+    )
+    events = asyncio.run(_collect(CLAIMS))
+
+    assert [(i, r["status"]) for i, r, _ in events] == [(0, "verified"), (1, "verified")]
+    # The fast claim doesn't wait for the slow claim's pages
+    assert events[0][2] < 0.3
+    assert events[1][2] >= 0.6
+
+
+def test_first_confirmation_cancels_the_claims_other_downloads(web):
+    fake = web(
+        {"moon": ["http://a/moon", "http://b/slow", "http://c/slower"]},
+        {
+            "http://a/moon": (0.05, SUPPORT["moon"]),
+            "http://b/slow": (2, "Unrelated."),
+            "http://c/slower": (3, "Unrelated."),
+        },
+    )
+    events = asyncio.run(_collect(CLAIMS[:1]))
+
+    assert events[0][1]["status"] == "verified"
+    assert events[0][1]["evidence"]["source"] == "http://a/moon"
+    assert events[0][2] < 0.5
+    assert sorted(fake.cancelled) == ["http://b/slow", "http://c/slower"]
+
+
+def test_download_shared_by_claims_is_fetched_once_and_kept_for_waiters(web):
+    both = SUPPORT["moon"] + " " + SUPPORT["budget"]
+    fake = web(
+        {"moon": ["http://a/moon", "http://shared/both"], "budget": ["http://shared/both"]},
+        {"http://a/moon": (0.01, SUPPORT["moon"]), "http://shared/both": (0.2, both)},
+    )
+    events = asyncio.run(_collect(CLAIMS))
+
+    # The moon claim confirming early must not cancel the page the budget claim still needs
+    assert {i: r["status"] for i, r, _ in events} == {0: "verified", 1: "verified"}
+    assert fake.started.count("http://shared/both") == 1
+    assert fake.cancelled == []
+
+
+def test_failures_and_timeouts_stay_per_claim(web):
+    web(
+        {"moon": RuntimeError("Search error: HTTP 429"), "budget": ["http://b/hang"]},
+        {"http://b/hang": (10, SUPPORT["budget"])},
+    )
+    events = asyncio.run(_collect(CLAIMS, time_budget=0.2))
+
+    assert [(i, r["status"]) for i, r, _ in events] == [(0, "search_failed"), (1, "timed_out")]
+    assert events[1][2] < 1
+
+
+def test_no_support_is_reported_once_all_sources_are_in(web):
+    web({"moon": ["http://a/x", "http://b/y"]}, {"http://a/x": (0.01, "Unrelated."), "http://b/y": (0.05, "Other text.")})
+    events = asyncio.run(_collect(CLAIMS[:1]))
+
+    assert events[0][1]["status"] == "no_evidence_found"
+
+
+def test_stream_emits_claim_events_as_each_claim_resolves(web, monkeypatch):
+    web(
+        {"moon": ["http://a/moon-fast"], "budget": ["http://b/budget-slow"]},
+        {"http://a/moon-fast": (0.05, SUPPORT["moon"]), "http://b/budget-slow": (0.5, SUPPORT["budget"])},
+    )
+
+    async def fake_extract(text):
+        return [dict(c) for c in CLAIMS]
+
+    async def fake_reason(verdict, verification):
+        return "reason"
+
+    monkeypatch.setattr(orchestrator, "extract_claims", fake_extract)
+    monkeypatch.setattr(orchestrator, "generate_reason", fake_reason)
+
+    async def scenario():
+        start = time.monotonic()
+        timeline = []
+        async for event in orchestrator.fact_check_events("some text"):
+            timeline.append((event["stage"], event.get("index"), time.monotonic() - start))
+        return timeline
+
+    timeline = asyncio.run(scenario())
+    stages = [(stage, index) for stage, index, _ in timeline]
+    assert stages == [
+        ("extract_claims", None), ("claim", 0), ("claim", 1),
+        ("verify_claims", None), ("generate_reason", None), ("result", None)
+    ]
+    first_claim, second_claim = timeline[1][2], timeline[2][2]
+    assert first_claim < 0.3 <= 0.5 <= second_claim
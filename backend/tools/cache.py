@@ -0,0 +1,235 @@
+"""
+Tiered Cache
+In-memory LRU tier backed by a SQLite store with TTL and size-bounded eviction
+"""
+import os
+import json
+import time
+import zlib
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from metrics import register_cache
+
+# Shared location for on-disk cache stores
+CACHE_DIR = os.getenv(
+    "CACHE_DIR",
+    str(Path(__file__).resolve().parent.parent / ".cache")
+)
+
+
+class TieredCache:
+    """
+    Two-tier key/value cache for JSON-serializable values.
+
+    Lookups hit the in-memory LRU first, then the SQLite store (WAL mode),
+    promoting disk hits back into memory. Entries expire after their TTL and
+    the disk store is trimmed least-recently-used first once it exceeds
+    max_disk_bytes, so the cache survives restarts without growing unbounded.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        ttl: float = 86400.0,
+        max_memory_items: int = 512,
+        max_disk_bytes: int = 256 * 1024 * 1024,
+        compress: bool = False,
+        persistent: bool = True
+    ):
+        self.name = name
+        self.ttl = ttl
+        self.max_memory_items = max_memory_items
+        self.max_disk_bytes = max_disk_bytes
+        self.compress = compress
+
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self._disk_bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.evictions = 0
+
+        if persistent:
+            self._open_store()
+
+        register_cache(self)
+
+    def _open_store(self):
+        """Open (or create) the SQLite store for this cache"""
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            db_path = os.path.join(CACHE_DIR, f"{self.name}.sqlite3")
+            self._db = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " key TEXT PRIMARY KEY,"
+                " value BLOB NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " expires_at REAL NOT NULL,"
+                " accessed_at REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS idx_accessed ON entries (accessed_at)")
+            self._db.execute("DELETE FROM entries WHERE expires_at < ?", (time.time(),))
+            row = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()
+            self._disk_bytes = row[0]
+        except sqlite3.Error as e:
+            print(f"Cache store error ({self.name}): {e}")
+            self._db = None
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a cached value.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value, or None on miss or expiry
+        """
+        now = time.time()
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at >= now:
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    self.memory_hits += 1
+                    return value
+                del self._memory[key]
+
+            if self._db is not None:
+                try:
+                    row = self._db.execute(
+                        "SELECT value, expires_at FROM entries WHERE key = ?", (key,)
+                    ).fetchone()
+                    if row and row[1] >= now:
+                        self._db.execute(
+                            "UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key)
+                        )
+                        value = self._decode(row[0])
+                        self._remember(key, row[1], value)
+                        self.hits += 1
+                        self.disk_hits += 1
+                        return value
+                except (sqlite3.Error, ValueError) as e:
+                    print(f"Cache read error ({self.name}): {e}")
+
+            self.misses += 1
+            return None
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        """
+        Store a value in both tiers.
+
+        Args:
+            key: Cache key
+            value: JSON-serializable value
+            ttl: Optional per-entry TTL in seconds (defaults to the cache TTL)
+        """
+        now = time.time()
+        expires_at = now + (self.ttl if ttl is None else ttl)
+
+        with self._lock:
+            self._remember(key, expires_at, value)
+
+            if self._db is None:
+                return
+
+            try:
+                blob = self._encode(value)
+                old = self._db.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+                self._db.execute(
+                    "INSERT OR REPLACE INTO entries (key, value, size, expires_at, accessed_at)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (key, blob, len(blob), expires_at, now)
+                )
+                self._disk_bytes += len(blob) - (old[0] if old else 0)
+                if self._disk_bytes > self.max_disk_bytes:
+                    self._evict_disk(now)
+            except (sqlite3.Error, TypeError, ValueError) as e:
+                print(f"Cache write error ({self.name}): {e}")
+
+    def delete(self, key: str):
+        """Remove a key from both tiers"""
+        with self._lock:
+            self._memory.pop(key, None)
+            if self._db is not None:
+                try:
+                    row = self._db.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+                    if row:
+                        self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+                        self._disk_bytes -= row[0]
+                except sqlite3.Error as e:
+                    print(f"Cache delete error ({self.name}): {e}")
+
+    def clear(self):
+        """Drop every entry from both tiers"""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM entries")
+                self._disk_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and tier sizes"""
+        lookups = self.hits + self.misses
+        return {
+            'name': self.name,
+            'hits': self.hits,
+            'misses': self.misses,
+            'memory_hits': self.memory_hits,
+            'disk_hits': self.disk_hits,
+            'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+            'evictions': self.evictions,
+            'memory_items': len(self._memory),
+            'disk_bytes': self._disk_bytes
+        }
+
+    def _remember(self, key: str, expires_at: float, value: Any):
+        """Insert into the memory tier, evicting the least recently used entry"""
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_items:
+            self._memory.popitem(last=False)
+
+    def _evict_disk(self, now: float):
+        """Drop expired entries, then oldest-accessed until under the size cap"""
+        self._db.execute("DELETE FROM entries WHERE expires_at < ?", (now,))
+        self._disk_bytes = self._db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()[0]
+
+        # Trim to 90% of the cap so eviction does not run on every write
+        target = int(self.max_disk_bytes * 0.9)
+        rows = self._db.execute(
+            "SELECT key, size FROM entries ORDER BY accessed_at ASC"
+        ).fetchall()
+        doomed = []
+        for key, size in rows:
+            if self._disk_bytes <= target:
+                break
+            doomed.append((key,))
+            self._disk_bytes -= size
+        if doomed:
+            self._db.executemany("DELETE FROM entries WHERE key = ?", doomed)
+            self.evictions += len(doomed)
+
+    def _encode(self, value: Any) -> bytes:
+        data = json.dumps(value, separators=(',', ':')).encode('utf-8')
+        return zlib.compress(data) if self.compress else data
+
+    def _decode(self, blob: bytes) -> Any:
+        data = zlib.decompress(blob) if self.compress else blob
+        return json.loads(data)
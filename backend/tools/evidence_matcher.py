@@ -0,0 +1,140 @@
+"""
+Evidence Matcher
+Fuzzy claim-to-passage matching over word shingles, scored for many claims and passages at once
+"""
+import os
+import re
+from typing import Any, Dict, List, Optional, Set
+
+# Weighted share of a claim's shingles a passage must contain to count as evidence
+EVIDENCE_MATCH_THRESHOLD = float(os.getenv("EVIDENCE_MATCH_THRESHOLD", "0.6"))
+
+# Sentences per passage; passages overlap by all but one sentence
+PASSAGE_SENTENCES = 3
+
+# Bigrams carry word order, so they count more than single words
+BIGRAM_WEIGHT = 1.5
+
+STOPWORDS = {
+    "a", "an", "the", "and", "or", "but", "of", "to", "in", "on", "at", "for", "by", "with",
+    "from", "as", "is", "are", "was", "were", "be", "been", "being", "it", "its", "this",
+    "that", "these", "those", "has", "have", "had", "will", "would", "can", "could", "not",
+    "no", "he", "she", "they", "we", "you", "i", "his", "her", "their", "our", "after", "over"
+}
+
+TOKEN = re.compile(r"[a-z0-9]+")
+SENTENCE_END = re.compile(r'(?<=[.!?])\s+|\n+')
+
+
+def _stem(token: str) -> str:
+    # Just enough normalization for "cures"/"cure", "officials"/"official"
+    if len(token) > 4 and token.endswith("ies"):
+        return token[:-3] + "y"
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def shingles(text: str) -> Set[str]:
+    """Content-word unigrams and adjacent bigrams of a text"""
+    words = [_stem(t) for t in TOKEN.findall(text.lower()) if t not in STOPWORDS]
+    terms = set(words)
+    terms.update(f"{a} {b}" for a, b in zip(words, words[1:]))
+    return terms
+
+
+def _passages(text: str) -> List[str]:
+    sentences = [s.strip() for s in SENTENCE_END.split(text or "") if s.strip()]
+    if len(sentences) <= PASSAGE_SENTENCES:
+        return [" ".join(sentences)] if sentences else []
+    return [
+        " ".join(sentences[i:i + PASSAGE_SENTENCES])
+        for i in range(len(sentences) - PASSAGE_SENTENCES + 1)
+    ]
+
+
+class EvidenceIndex:
+    """
+    Shingled passages of one or more documents.
+
+    Claims are scored against every passage in one matrix product: each
+    claim is a vector of shingle weights (bigrams above words), each passage
+    a binary shingle-presence vector, and a claim's score for a passage is
+    the weighted share of its shingles that the passage contains (1.0 for a
+    verbatim match). Weights depend only on the claim, not on the indexed
+    documents, so a passage scores the same however long its page is.
+    Matching finds supporting passages; it doesn't judge whether the passage
+    affirms or refutes the claim.
+    """
+
+    def __init__(self, documents: List[Dict[str, str]]):
+        """
+        Args:
+            documents: Dicts with 'text' and 'source' (e.g. scrape_url results)
+        """
+        self.passages: List[str] = []
+        self.sources: List[str] = []
+        self._terms: List[Set[str]] = []
+
+        for doc in documents:
+            for passage in _passages(doc.get("text", "")):
+                self.passages.append(passage)
+                self.sources.append(doc.get("source", ""))
+                self._terms.append(shingles(passage))
+
+    def score(self, claims: List[str]):
+        """
+        Score every claim against every passage.
+
+        Returns:
+            numpy array of shape (len(claims), number of passages), values in [0, 1]
+        """
+        # Imported lazily: the API process doesn't pay for numpy until it verifies claims
+        import numpy as np
+
+        claim_terms = [shingles(c) for c in claims]
+        vocab = {t: i for i, t in enumerate(sorted(set().union(*claim_terms)))} if claims else {}
+        if not vocab or not self.passages:
+            return np.zeros((len(claims), len(self.passages)), dtype=np.float32)
+
+        weights = np.zeros((len(claims), len(vocab)), dtype=np.float32)
+        for row, terms in enumerate(claim_terms):
+            for term in terms:
+                weights[row, vocab[term]] = BIGRAM_WEIGHT if " " in term else 1.0
+
+        # Only claim vocabulary matters, so passages are projected onto it
+        present = np.zeros((len(self.passages), len(vocab)), dtype=np.float32)
+        for row, terms in enumerate(self._terms):
+            cols = [vocab[t] for t in terms if t in vocab]
+            present[row, cols] = 1.0
+
+        totals = weights.sum(axis=1, keepdims=True)
+        totals[totals == 0] = 1.0
+        return np.minimum((weights @ present.T) / totals, 1.0)
+
+    def match(self, claims: List[str], threshold: Optional[float] = None) -> List[Optional[Dict[str, Any]]]:
+        """
+        Best supporting passage for each claim.
+
+        Args:
+            claims: Claim texts
+            threshold: Minimum score (defaults to EVIDENCE_MATCH_THRESHOLD)
+
+        Returns:
+            Per claim, {'source', 'passage', 'score'} of the best passage, or None below the threshold
+        """
+        threshold = EVIDENCE_MATCH_THRESHOLD if threshold is None else threshold
+        scores = self.score(claims)
+
+        matches: List[Optional[Dict[str, Any]]] = []
+        for row in range(len(claims)):
+            if scores.shape[1] == 0:
+                matches.append(None)
+                continue
+            best = int(scores[row].argmax())
+            score = float(scores[row, best])
+            matches.append(
+                {'source': self.sources[best], 'passage': self.passages[best], 'score': round(score, 3)}
+                if score >= threshold else None
+            )
+        return matches
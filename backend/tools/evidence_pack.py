@@ -1,9 +1,11 @@
-from reportlab.lib.pagesizes import A4
-from reportlab.pdfgen import canvas
 from io import BytesIO
 from datetime import datetime
 
 def generate_evidence_pdf(evidence: dict) -> BytesIO:
+    # reportlab is only needed by this endpoint; import on first use
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen import canvas
+
     buffer = BytesIO()
     pdf = canvas.Canvas(buffer, pagesize=A4)
 
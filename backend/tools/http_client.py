@@ -0,0 +1,29 @@
+"""
+Shared HTTP Client
+Process-wide pooled async HTTP client for outbound calls (Ollama, search, scraping)
+"""
+from typing import Optional
+
+_client: Optional["httpx.AsyncClient"] = None
+
+
+def get_http_client() -> "httpx.AsyncClient":
+    """Return the shared AsyncClient, creating it on first use"""
+    global _client
+    if _client is None or _client.is_closed:
+        # Imported lazily: workers that never call out don't pay for httpx
+        import httpx
+
+        _client = httpx.AsyncClient(
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+        )
+    return _client
+
+
+async def close_http_client():
+    """Close the shared client (called on application shutdown)"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -0,0 +1,49 @@
+"""
+LLM Output Cache
+Disk-backed cache of Ollama outputs keyed by normalized input, model and prompt version
+"""
+import os
+import re
+import json
+import hashlib
+from typing import Any, Dict, Optional
+
+from tools.cache import TieredCache
+from tools.ollama_client import OLLAMA_MODEL
+
+
+def prompt_version(template: str, options: Optional[Dict[str, Any]] = None) -> str:
+    """Fingerprint of a prompt template and its generation options"""
+    payload = json.dumps({'template': template, 'options': options or {}}, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:12]
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace so re-forwarded copies of a message share an entry"""
+    return re.sub(r'\s+', ' ', text or '').strip()
+
+
+def build_llm_cache_key(task: str, version: str, text: str) -> str:
+    """
+    Build the cache key for one LLM task over one input.
+
+    Args:
+        task: Calling agent (extract_claims, generate_reason)
+        version: prompt_version() of the agent's template and options
+        text: The variable part of the prompt
+
+    Returns:
+        Opaque cache key string
+    """
+    digest = hashlib.sha256(normalize_text(text).encode('utf-8')).hexdigest()
+    return f"{task}:{OLLAMA_MODEL}:{version}:{digest}"
+
+
+# Global instance
+llm_cache = TieredCache(
+    name="llm_outputs",
+    ttl=float(os.getenv("LLM_CACHE_TTL_SECONDS", str(30 * 86400))),
+    max_memory_items=int(os.getenv("LLM_CACHE_MEMORY_ITEMS", "2048")),
+    max_disk_bytes=int(os.getenv("LLM_CACHE_MAX_MB", "128")) * 1024 * 1024,
+    compress=True
+)
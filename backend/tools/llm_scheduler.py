@@ -0,0 +1,193 @@
+"""
+LLM Scheduler
+Priority classes, per-client fair queuing and deadlines in front of the local Ollama instance
+"""
+import os
+import time
+import asyncio
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+from metrics import LLM_DROPPED, register_queue
+
+
+INTERACTIVE = 'interactive'
+BATCH = 'batch'
+
+# Highest priority first
+PRIORITIES = (INTERACTIVE, BATCH)
+
+# How long a call may wait for a slot before it is dropped (0 = wait indefinitely)
+DEFAULT_TIMEOUTS = {
+    INTERACTIVE: float(os.getenv("LLM_INTERACTIVE_TIMEOUT", "60")),
+    BATCH: float(os.getenv("LLM_BATCH_TIMEOUT", "0")),
+}
+
+# Who is asking, set per request/job and inherited by the tasks it starts
+_priority: ContextVar[str] = ContextVar('llm_priority', default=INTERACTIVE)
+_client: ContextVar[str] = ContextVar('llm_client', default='anonymous')
+_deadline: ContextVar[Optional[float]] = ContextVar('llm_deadline', default=None)
+
+
+class LLMDeadlineExceeded(Exception):
+    """Raised when a call could not start before its caller's deadline"""
+
+
+@contextmanager
+def llm_context(priority: str = INTERACTIVE, client: str = 'anonymous', timeout: Optional[float] = None):
+    """
+    Tag LLM calls made inside the block with a priority class, client and deadline.
+
+    Usage:
+        with llm_context(BATCH, client=job.id):
+            await fact_check_pipeline(text)
+
+    Args:
+        priority: INTERACTIVE or BATCH
+        client: Fairness key (e.g. client address); clients in one class take turns
+        timeout: Seconds the caller is willing to wait; defaults per priority class
+    """
+    if timeout is None:
+        timeout = DEFAULT_TIMEOUTS[priority]
+    deadline = time.monotonic() + timeout if timeout > 0 else None
+
+    tokens = (_priority.set(priority), _client.set(client), _deadline.set(deadline))
+    try:
+        yield
+    finally:
+        _deadline.reset(tokens[2])
+        _client.reset(tokens[1])
+        _priority.reset(tokens[0])
+
+
+def current_priority() -> str:
+    """Priority class of the calling context"""
+    return _priority.get()
+
+
+class _Ticket:
+    __slots__ = ('future', 'client', 'priority', 'deadline')
+
+    def __init__(self, future: asyncio.Future, client: str, priority: str, deadline: Optional[float]):
+        self.future = future
+        self.client = client
+        self.priority = priority
+        self.deadline = deadline
+
+
+class LLMScheduler:
+    """
+    Bounded concurrency with strict priority classes and round-robin across clients.
+
+    At most `concurrency` calls run at once (match OLLAMA_NUM_PARALLEL).
+    When a slot frees up it goes to the highest priority class with waiters;
+    within a class, clients take turns so one bulk submitter can't hold the
+    queue. Waiters whose deadline has passed are dropped rather than run.
+    """
+
+    def __init__(self, name: str, concurrency: int):
+        self.name = name
+        self.concurrency = concurrency
+        self.active = 0
+        # priority -> client -> waiting tickets
+        self._queues: Dict[str, "OrderedDict[str, deque]"] = {p: OrderedDict() for p in PRIORITIES}
+
+    def waiting(self, priority: Optional[str] = None) -> int:
+        priorities = (priority,) if priority else PRIORITIES
+        return sum(len(q) for p in priorities for q in self._queues[p].values())
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold one of the scheduler's slots for the duration of the block"""
+        await self.acquire(_priority.get(), _client.get(), _deadline.get())
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def acquire(self, priority: str, client: str, deadline: Optional[float]):
+        if self.active < self.concurrency and not self.waiting():
+            self.active += 1
+            return
+
+        if deadline is not None and deadline <= time.monotonic():
+            LLM_DROPPED.labels(priority, 'deadline').inc()
+            raise LLMDeadlineExceeded(f"{self.name}: deadline passed before the call was queued")
+
+        ticket = _Ticket(asyncio.get_running_loop().create_future(), client, priority, deadline)
+        self._queues[priority].setdefault(client, deque()).append(ticket)
+        timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+        try:
+            await asyncio.wait_for(asyncio.shield(ticket.future), timeout=timeout)
+        except asyncio.TimeoutError:
+            self._discard(ticket)
+            # The slot may have been handed over just as the deadline hit
+            if ticket.future.done() and not ticket.future.cancelled() and ticket.future.exception() is None:
+                self.release()
+            else:
+                ticket.future.cancel()
+            LLM_DROPPED.labels(priority, 'deadline').inc()
+            raise LLMDeadlineExceeded(f"{self.name}: no free slot before the caller's deadline")
+        except asyncio.CancelledError:
+            # The caller gave up (client disconnect); hand back a slot we may already hold
+            self._discard(ticket)
+            if ticket.future.done() and not ticket.future.cancelled() and ticket.future.exception() is None:
+                self.release()
+            else:
+                ticket.future.cancel()
+            LLM_DROPPED.labels(priority, 'cancelled').inc()
+            raise
+
+    def release(self):
+        now = time.monotonic()
+        while True:
+            ticket = self._next_ticket()
+            if ticket is None:
+                self.active -= 1
+                return
+            if ticket.future.done():
+                continue
+            if ticket.deadline is not None and ticket.deadline <= now:
+                # Caller won't wait for the result any more; don't spend GPU time on it
+                LLM_DROPPED.labels(ticket.priority, 'deadline').inc()
+                ticket.future.set_exception(LLMDeadlineExceeded(f"{self.name}: deadline passed in queue"))
+                continue
+            ticket.future.set_result(None)
+            return
+
+    def _next_ticket(self) -> Optional[_Ticket]:
+        for priority in PRIORITIES:
+            clients = self._queues[priority]
+            while clients:
+                client, tickets = next(iter(clients.items()))
+                ticket = tickets.popleft()
+                if tickets:
+                    # Round-robin: this client goes to the back of its class
+                    clients.move_to_end(client)
+                else:
+                    del clients[client]
+                return ticket
+        return None
+
+    def _discard(self, ticket: _Ticket):
+        tickets = self._queues[ticket.priority].get(ticket.client)
+        if tickets and ticket in tickets:
+            tickets.remove(ticket)
+            if not tickets:
+                del self._queues[ticket.priority][ticket.client]
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'active': self.active,
+            'concurrency': self.concurrency,
+            **{f'waiting_{p}': self.waiting(p) for p in PRIORITIES}
+        }
+
+
+# Global instance
+llm_scheduler = LLMScheduler("ollama", concurrency=int(os.getenv("OLLAMA_NUM_PARALLEL", "2")))
+for _p in PRIORITIES:
+    register_queue(f"llm_waiting_{_p}", lambda p=_p: llm_scheduler.waiting(p))
+register_queue("llm_running", lambda: llm_scheduler.active)
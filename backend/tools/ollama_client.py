@@ -1,14 +1,55 @@
-import requests
+import os
+import json
+from typing import AsyncIterator, Dict, Optional
 
-OLLAMA_URL = "http://localhost:11434/api/generate"
+from tools.http_client import get_http_client
+from tools.singleflight import SingleFlight
+from tools.llm_scheduler import llm_scheduler, current_priority
+from metrics import track_stage
 
-def run_ollama(prompt: str) -> str:
+OLLAMA_URL = os.getenv("OLLAMA_URL", "http://localhost:11434/api/generate")
+OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "llama3.1:latest")
+OLLAMA_CONNECT_TIMEOUT = float(os.getenv("OLLAMA_CONNECT_TIMEOUT", "5"))
+OLLAMA_TIMEOUT = float(os.getenv("OLLAMA_TIMEOUT", "120"))
+# How long Ollama keeps the model loaded after a request (e.g. "30m", "-1" = forever)
+OLLAMA_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+
+# Identical prompts arriving together share one generation
+_inflight = SingleFlight("ollama_generate")
+
+
+def _payload(prompt: str, options: Optional[Dict], stream: bool) -> Dict:
     payload = {
-        "model": "llama3.1:latest",
+        "model": OLLAMA_MODEL,
         "prompt": prompt,
-        "stream": False
+        "stream": stream,
+        "keep_alive": OLLAMA_KEEP_ALIVE
     }
-    res = requests.post(OLLAMA_URL, json=payload)
+    if options:
+        # Per-call generation options, e.g. {"num_predict": 256, "num_ctx": 2048}
+        payload["options"] = options
+    return payload
+
+
+def _timeout():
+    import httpx
+    # Read timeout applies between bytes, so long streamed generations don't time out
+    return httpx.Timeout(OLLAMA_TIMEOUT, connect=OLLAMA_CONNECT_TIMEOUT)
+
+
+async def run_ollama(prompt: str, options: Optional[Dict] = None) -> str:
+    # The shared call queues with its first caller's priority and deadline, so
+    # only callers of the same class share one; an interactive request never
+    # waits behind (or is dropped with) a batch job's call
+    key = SingleFlight.key(OLLAMA_MODEL, current_priority(), json.dumps(options or {}, sort_keys=True), prompt)
+    return await _inflight.do(key, lambda: _generate(prompt, options))
+
+
+async def _generate(prompt: str, options: Optional[Dict]) -> str:
+    payload = _payload(prompt, options, stream=False)
+    async with llm_scheduler.slot():
+        with track_stage("ollama_generate"):
+            res = await get_http_client().post(OLLAMA_URL, json=payload, timeout=_timeout())
 
     if res.status_code != 200:
         raise RuntimeError(f"Ollama error: {res.text}")
@@ -21,4 +62,26 @@ def run_ollama(prompt: str) -> str:
     if "error" in data:
         raise RuntimeError(f"Ollama returned error: {data['error']}")
 
-    return ""
\ No newline at end of file
+    return ""
+
+
+async def stream_ollama(prompt: str, options: Optional[Dict] = None) -> AsyncIterator[str]:
+    # Yields response fragments as Ollama generates them
+    payload = _payload(prompt, options, stream=True)
+    async with llm_scheduler.slot():
+        with track_stage("ollama_stream"):
+            async with get_http_client().stream("POST", OLLAMA_URL, json=payload, timeout=_timeout()) as res:
+                if res.status_code != 200:
+                    await res.aread()
+                    raise RuntimeError(f"Ollama error: {res.text}")
+
+                async for line in res.aiter_lines():
+                    if not line.strip():
+                        continue
+                    data = json.loads(line)
+                    if "error" in data:
+                        raise RuntimeError(f"Ollama returned error: {data['error']}")
+                    if data.get("response"):
+                        yield data["response"]
+                    if data.get("done"):
+                        return
@@ -0,0 +1,51 @@
+"""
+Rate Limiting
+Async token buckets, one per upstream host, to stay under provider rate limits
+"""
+import time
+import asyncio
+from typing import Dict
+from urllib.parse import urlsplit
+
+
+class TokenBucket:
+    """
+    Classic token bucket: `rate` requests per second on average, with bursts
+    of up to `burst`. Callers wait for a token instead of being rejected.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = None
+
+    async def acquire(self):
+        if self.rate <= 0:
+            return
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        # Serialized so waiters are served in arrival order
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+_buckets: Dict[str, TokenBucket] = {}
+
+
+def rate_limiter_for(url: str, rate: float, burst: int = 1) -> TokenBucket:
+    """Shared bucket for the host of `url` (created with the given limits on first use)"""
+    host = urlsplit(url).netloc.lower()
+    bucket = _buckets.get(host)
+    if bucket is None:
+        bucket = _buckets[host] = TokenBucket(rate, burst)
+    return bucket
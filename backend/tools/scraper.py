@@ -1,20 +1,104 @@
-from newspaper import Article
+import os
+import time
+import asyncio
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from tools.http_client import get_http_client
+from tools.cache import TieredCache
+from metrics import track_stage
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0"
+}
+
+SCRAPE_TIMEOUT = 7
+
+# Parsed articles are fresh for ARTICLE_CACHE_TTL seconds; after that they are
+# revalidated with a conditional GET and kept for up to ARTICLE_CACHE_MAX_AGE
+ARTICLE_CACHE_TTL = float(os.getenv("ARTICLE_CACHE_TTL_SECONDS", str(6 * 3600)))
+ARTICLE_CACHE_MAX_AGE = float(os.getenv("ARTICLE_CACHE_MAX_AGE_SECONDS", str(30 * 86400)))
+
+article_cache = TieredCache(
+    name="articles",
+    ttl=ARTICLE_CACHE_MAX_AGE,
+    max_memory_items=int(os.getenv("ARTICLE_CACHE_MEMORY_ITEMS", "512")),
+    max_disk_bytes=int(os.getenv("ARTICLE_CACHE_MAX_MB", "512")) * 1024 * 1024,
+    compress=True
+)
+
+TRACKING_PARAMS = {"fbclid", "gclid", "igshid", "mc_cid", "mc_eid", "ref", "ref_src", "cmpid"}
+
+
+def canonical_url(url: str) -> str:
+    # Same article behind tracking params, fragments or host casing shares one entry
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and not (scheme, parts.port) in (("http", 80), ("https", 443)):
+        host = f"{host}:{parts.port}"
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in TRACKING_PARAMS
+    )
+    return urlunsplit((scheme, host, parts.path or "/", urlencode(query), ""))
+
+
+async def scrape_url(url: str):
+    key = canonical_url(url)
+    cached = article_cache.get(key)
+    if cached is not None and cached["fresh_until"] > time.time():
+        return _article(cached, url)
 
-def scrape_url(url: str):
     try:
-        article = Article(url)
-        article.download()
-        article.parse()
+        # Download without blocking the event loop, then parse off-loop
+        with track_stage("scrape_url"):
+            headers = dict(HEADERS)
+            if cached is not None:
+                if cached.get("etag"):
+                    headers["If-None-Match"] = cached["etag"]
+                if cached.get("last_modified"):
+                    headers["If-Modified-Since"] = cached["last_modified"]
 
-        return {
+            res = await get_http_client().get(url, headers=headers, timeout=SCRAPE_TIMEOUT)
+
+            if res.status_code == 304 and cached is not None:
+                # Unchanged upstream: keep the parsed copy, reset its freshness
+                cached = dict(cached, fresh_until=time.time() + ARTICLE_CACHE_TTL)
+                article_cache.set(key, cached)
+                return _article(cached, url)
+
+            res.raise_for_status()
+
+            # newspaper (nltk, lxml) is heavy; load it only when scraping
+            from newspaper import Article
+
+            article = Article(url)
+            article.download(input_html=res.text)
+            await asyncio.to_thread(article.parse)
+
+        entry = {
             "title": article.title,
             "text": article.text,
-            "source": url
+            "etag": res.headers.get("etag"),
+            "last_modified": res.headers.get("last-modified"),
+            "fresh_until": time.time() + ARTICLE_CACHE_TTL
         }
+        article_cache.set(key, entry)
+        return _article(entry, url)
     except Exception as e:
+        if cached is not None:
+            # Upstream is failing; a stale copy beats no evidence
+            return _article(cached, url)
         return {
             "title": "",
             "text": "",
             "source": url,
             "error": str(e)
         }
+
+
+def _article(entry, url):
+    return {
+        "title": entry["title"],
+        "text": entry["text"],
+        "source": url
+    }
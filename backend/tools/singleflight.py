@@ -0,0 +1,80 @@
+"""
+Single Flight
+Coalesces identical concurrent async calls into one upstream call shared by every caller
+"""
+import asyncio
+import hashlib
+from typing import Any, Awaitable, Callable, Dict
+
+from metrics import COALESCED_CALLS
+
+
+class SingleFlight:
+    """
+    Deduplicate in-flight work by key.
+
+    The first caller for a key starts the work; callers arriving while it is
+    still running wait for the same result (or exception) instead of issuing
+    their own call. Nothing is remembered once the call completes, so this is
+    a burst absorber, not a cache.
+
+    The shared call runs as its own task: a caller that is cancelled (e.g. a
+    client disconnect) doesn't cancel it for the others. It is only cancelled
+    once every caller waiting on it has gone away.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[str, asyncio.Task] = {}
+        self._waiters: Dict[str, int] = {}
+
+    @staticmethod
+    def key(*parts: str) -> str:
+        """Stable key for a call built from its inputs (e.g. model and prompt)"""
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(part.encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run fn() unless an identical call is already in flight, then share its result.
+
+        Args:
+            key: Identity of the call
+            fn: Zero-argument coroutine function performing the call
+
+        Returns:
+            Result of the shared call
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.create_task(fn())
+            self._calls[key] = task
+            self._waiters[key] = 0
+            task.add_done_callback(lambda _: self._forget(key, task))
+        else:
+            COALESCED_CALLS.labels(self.name).inc()
+
+        self._waiters[key] += 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self._calls.get(key) is task and self._waiters[key] == 1 and not task.done():
+                task.cancel()
+            raise
+        finally:
+            if self._calls.get(key) is task:
+                self._waiters[key] -= 1
+
+    def _forget(self, key: str, task: asyncio.Task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+            del self._waiters[key]
+        # Retrieve the exception so an unawaited failure isn't logged as lost
+        if not task.cancelled():
+            task.exception()
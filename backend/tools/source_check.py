@@ -1,19 +1,68 @@
-import requests
-from bs4 import BeautifulSoup
+import os
+import re
+from tools.http_client import get_http_client
+from tools.cache import TieredCache
+from tools.rate_limit import rate_limiter_for
+from tools.singleflight import SingleFlight
+from metrics import track_stage
 
 HEADERS = {
     "User-Agent": "Mozilla/5.0"
 }
 
-def search_web(query: str, max_results: int = 5):
+SEARCH_URL = os.getenv("SEARCH_URL", "https://duckduckgo.com/html/")
+SEARCH_TIMEOUT = float(os.getenv("SEARCH_TIMEOUT", "10"))
+
+# Requests per second (and burst) allowed against the search provider
+SEARCH_RATE = float(os.getenv("SEARCH_RATE_PER_SECOND", "2"))
+SEARCH_BURST = int(os.getenv("SEARCH_RATE_BURST", "4"))
+
+# Results are reused for SEARCH_CACHE_TTL; queries with no results for the shorter negative TTL
+SEARCH_CACHE_TTL = float(os.getenv("SEARCH_CACHE_TTL_SECONDS", "3600"))
+SEARCH_NEGATIVE_TTL = float(os.getenv("SEARCH_NEGATIVE_TTL_SECONDS", "300"))
+
+search_cache = TieredCache(
+    name="search_results",
+    ttl=SEARCH_CACHE_TTL,
+    max_memory_items=int(os.getenv("SEARCH_CACHE_MEMORY_ITEMS", "2048")),
+    max_disk_bytes=int(os.getenv("SEARCH_CACHE_MAX_MB", "32")) * 1024 * 1024
+)
+
+# Identical queries in flight share one request
+_inflight = SingleFlight("search_web")
+
+
+def normalize_query(query: str) -> str:
+    return re.sub(r'\s+', ' ', (query or "").lower()).strip(" \t.!?\"'")
+
+
+async def search_web(query: str, max_results: int = 5):
     """
     Simple web search using DuckDuckGo HTML
     (No API key required – hackathon safe)
     """
-    search_url = "https://duckduckgo.com/html/"
+    key = f"{SEARCH_URL}:{max_results}:{normalize_query(query)}"
+    links = search_cache.get(key)
+    if links is not None:
+        return list(links)
+
+    return list(await _inflight.do(key, lambda: _search(query, max_results, key)))
+
+
+async def _search(query: str, max_results: int, key: str):
     params = {"q": query}
 
-    res = requests.post(search_url, data=params, headers=HEADERS, timeout=10)
+    await rate_limiter_for(SEARCH_URL, SEARCH_RATE, SEARCH_BURST).acquire()
+    with track_stage("search_web"):
+        res = await get_http_client().post(SEARCH_URL, data=params, headers=HEADERS, timeout=SEARCH_TIMEOUT)
+
+    if res.status_code != 200:
+        # Throttled or failing: that isn't "no results", so raise (the claim is reported
+        # as search_failed) and don't cache anything
+        raise RuntimeError(f"Search error: HTTP {res.status_code}")
+
+    from bs4 import BeautifulSoup
+
     soup = BeautifulSoup(res.text, "html.parser")
 
     links = []
@@ -22,4 +71,5 @@ def search_web(query: str, max_results: int = 5):
         if href and href.startswith("http"):
             links.append(href)
 
+    search_cache.set(key, links, ttl=SEARCH_CACHE_TTL if links else SEARCH_NEGATIVE_TTL)
     return links
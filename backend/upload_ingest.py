@@ -0,0 +1,254 @@
+"""
+Upload Ingest
+Streams uploaded media to disk in fixed-size chunks, hashing and sniffing in a single pass
+"""
+import os
+import json
+import hashlib
+import tempfile
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from fastapi import UploadFile, HTTPException
+from starlette.concurrency import run_in_threadpool
+
+from metrics import route_template
+
+
+# Bytes read from the upload per iteration; memory per request stays at one chunk
+CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(1024 * 1024)))
+
+# Per-modality size caps (configurable via environment, in megabytes)
+MAX_UPLOAD_BYTES = {
+    'image': int(os.getenv("MAX_IMAGE_UPLOAD_MB", "25")) * 1024 * 1024,
+    'video': int(os.getenv("MAX_VIDEO_UPLOAD_MB", "2048")) * 1024 * 1024,
+    'audio': int(os.getenv("MAX_AUDIO_UPLOAD_MB", "200")) * 1024 * 1024,
+}
+
+# Whole request body cap for routes that take several files
+MAX_BATCH_UPLOAD_BYTES = int(os.getenv("MAX_BATCH_UPLOAD_MB", "4096")) * 1024 * 1024
+
+# Allowance for multipart boundaries, part headers and the other form fields
+MULTIPART_OVERHEAD = 1024 * 1024
+
+# Route template -> modality whose cap bounds the request body, or None for the batch cap
+UPLOAD_ROUTES = {
+    ('POST', '/analyze/image'): 'image',
+    ('POST', '/analyze/video'): 'video',
+    ('POST', '/analyze/audio'): 'audio',
+    ('POST', '/jobs'): max(MAX_UPLOAD_BYTES, key=MAX_UPLOAD_BYTES.get),
+    ('POST', '/analyze/batch'): None,
+}
+
+# Leading bytes needed to recognise every signature below
+SNIFF_BYTES = 16
+
+# Containers that carry audio-only or video streams alike; accepted for either modality
+AUDIO_OR_VIDEO_TYPES = {'video/x-matroska', 'application/ogg', 'application/mp4'}
+
+
+def sniff_media_type(header: bytes) -> Optional[str]:
+    """
+    Identify a media container from its leading bytes.
+
+    Args:
+        header: First bytes of the file (at least SNIFF_BYTES when available)
+
+    Returns:
+        MIME type string, or None if the signature is not recognised
+    """
+    if header.startswith(b'\xff\xd8\xff'):
+        return 'image/jpeg'
+    if header.startswith(b'\x89PNG\r\n\x1a\n'):
+        return 'image/png'
+    if header.startswith((b'GIF87a', b'GIF89a')):
+        return 'image/gif'
+    if header.startswith(b'BM'):
+        return 'image/bmp'
+    if header.startswith((b'II*\x00', b'MM\x00*')):
+        return 'image/tiff'
+    if header.startswith(b'RIFF') and len(header) >= 12:
+        riff_type = header[8:12]
+        if riff_type == b'WEBP':
+            return 'image/webp'
+        if riff_type == b'WAVE':
+            return 'audio/wav'
+        if riff_type == b'AVI ':
+            return 'video/x-msvideo'
+    if header[4:8] == b'ftyp':
+        brand = header[8:12]
+        if brand in (b'M4A ', b'M4B ', b'M4P '):
+            return 'audio/mp4'
+        if brand == b'M4V ':
+            return 'video/mp4'
+        if brand == b'qt  ':
+            return 'video/quicktime'
+        if brand.startswith((b'heic', b'heix', b'mif1', b'avif')):
+            return 'image/heif'
+        # Generic ISO-BMFF brands (isom, mp42, dash, ...) say nothing about the tracks
+        return 'application/mp4'
+    if header.startswith(b'\x1a\x45\xdf\xa3'):
+        # Matroska and WebM, including audio-only MediaRecorder output
+        return 'video/x-matroska'
+    if header.startswith(b'ID3') or header[:2] in (b'\xff\xfb', b'\xff\xf3', b'\xff\xf2'):
+        return 'audio/mpeg'
+    if header.startswith(b'OggS'):
+        return 'application/ogg'
+    if header.startswith(b'fLaC'):
+        return 'audio/flac'
+    return None
+
+
+async def ingest_upload(file: UploadFile, modality: str) -> Dict[str, Any]:
+    """
+    Stream an upload to a temporary file, enforcing the modality's size cap.
+
+    The SHA-256 digest and magic-byte sniff are computed while the chunks are
+    written, so the file is only read once and never held fully in memory.
+    The caller owns the returned path and must unlink it.
+
+    Args:
+        file: Uploaded file from the request
+        modality: Expected media type (image, video, audio)
+
+    Returns:
+        Dictionary with path, sha256, size and detected_type
+
+    Raises:
+        HTTPException: 413 if the upload exceeds the cap, 415 if the content
+            is recognisably a different kind of media than declared
+    """
+    max_bytes = MAX_UPLOAD_BYTES.get(modality)
+
+    # The request body was already capped by UploadSizeMiddleware; this is the per-file cap
+    sha256 = hashlib.sha256()
+    size = 0
+    header = b''
+    detected_type = None
+
+    suffix = Path(file.filename or '').suffix
+    tmp_file = tempfile.NamedTemporaryFile(delete=False, suffix=suffix)
+    tmp_path = tmp_file.name
+
+    try:
+        with tmp_file:
+            while True:
+                chunk = await file.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+
+                size += len(chunk)
+                if max_bytes and size > max_bytes:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"File too large. Maximum {modality} size is {max_bytes // (1024 * 1024)} MB."
+                    )
+
+                if len(header) < SNIFF_BYTES:
+                    header += chunk[:SNIFF_BYTES - len(header)]
+                    if len(header) >= SNIFF_BYTES:
+                        detected_type = sniff_media_type(header)
+                        _check_modality(detected_type, modality)
+
+                sha256.update(chunk)
+                await run_in_threadpool(tmp_file.write, chunk)
+
+        # Files shorter than the sniff window
+        if len(header) < SNIFF_BYTES:
+            detected_type = sniff_media_type(header)
+            _check_modality(detected_type, modality)
+
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+    return {
+        'path': tmp_path,
+        'sha256': sha256.hexdigest(),
+        'size': size,
+        'detected_type': detected_type
+    }
+
+
+def _check_modality(detected_type: Optional[str], modality: str):
+    """Reject content whose signature belongs to a different modality"""
+    # Unrecognised containers are let through; the detectors flag unusual formats
+    if not detected_type:
+        return
+    if detected_type in AUDIO_OR_VIDEO_TYPES and modality in ('audio', 'video'):
+        return
+    if not detected_type.startswith(f"{modality}/"):
+        raise HTTPException(
+            status_code=415,
+            detail=f"File content looks like {detected_type}, expected {modality}."
+        )
+
+
+class UploadSizeMiddleware:
+    """
+    ASGI middleware capping the request body of upload routes.
+
+    Multipart forms are spooled to disk by the form parser before a route
+    handler runs, so the per-file cap in ingest_upload alone would only fire
+    after the whole body had been received. Requests whose Content-Length
+    exceeds the route's cap are rejected with 413 before any body is read;
+    bodies without a length (chunked) fail with 413 once they pass the cap.
+    """
+
+    def __init__(self, app, routes: Dict = None):
+        self.app = app
+        self.routes = routes if routes is not None else UPLOAD_ROUTES
+
+    def _cap_for(self, scope) -> Optional[int]:
+        key = (scope['method'], route_template(scope))
+        if key not in self.routes:
+            return None
+        modality = self.routes[key]
+        return MAX_UPLOAD_BYTES[modality] if modality else MAX_BATCH_UPLOAD_BYTES
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        cap = self._cap_for(scope)
+        if cap is None:
+            await self.app(scope, receive, send)
+            return
+
+        limit = cap + MULTIPART_OVERHEAD
+        content_length = dict(scope['headers']).get(b'content-length')
+        if content_length is not None and content_length.isdigit() and int(content_length) > limit:
+            await self._reject(send, cap)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message['type'] == 'http.request':
+                received += len(message.get('body', b''))
+                if received > limit:
+                    # Raised inside the form parser; the app's exception handler renders it
+                    raise HTTPException(status_code=413, detail=_too_large(cap))
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+    async def _reject(self, send, cap: int):
+        body = json.dumps({'detail': _too_large(cap)}).encode('utf-8')
+        await send({
+            'type': 'http.response.start',
+            'status': 413,
+            'headers': [
+                (b'content-type', b'application/json'),
+                (b'content-length', str(len(body)).encode('latin-1')),
+                (b'connection', b'close'),
+            ]
+        })
+        await send({'type': 'http.response.body', 'body': body})
+
+
+def _too_large(cap: int) -> str:
+    return f"Upload too large. Maximum is {cap // (1024 * 1024)} MB."